@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Benchmark of the segmenter on long, abbreviation-dense biomedical (PMC-style) text.
+
+The end-anchored checks of the segmenter (STRUCTURAL_ABBREVIATIONS, BEFORE_LOWER, ...) are matched
+backwards from the end of each span with the reversed ``*_SUFFIX`` patterns. For comparison, the previous
+forward searches are swapped back in, which try every start position in the span and therefore
+get slower the longer the spans that are joined into one sentence grow. Example::
+
+    python benchmarks/abbreviation_suffixes.py --sizes 10K,100K,1M
+"""
+from __future__ import division, print_function, unicode_literals
+
+import os
+import random
+import sys
+from argparse import ArgumentParser
+from timeit import default_timer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import segmenter  # noqa: E402
+from common import parse_size  # noqa: E402
+
+SNIPPETS = [
+    'Mice (n = 12; cf. Fig. 2A) were treated i.v. with 5 mg/kg, i.e. the dose used by Smith et al. in 2010.',
+    'Cultures of E. coli, S. aureus, and B. subtilis spp. were grown at 37 °C approx. 18 h.',
+    'As reported by Dr. Jones (J. Biol. Chem. 12: 345-350, 1998), p53 was up-regulated, e.g. in liver.',
+    'The U.S. samples (vs. the E.U. ones) were collected on 3 Jan. 2005 and stored at -80 °C.',
+    'Expression in m. musculus and r. norvegicus was measured, approx. 2-fold, cf. Table 1.',
+    'Fig. 3 shows the results; No. 4 and No. 5 are controls, i.e. untreated, and vol. 2 has details.',
+]
+"Abbreviation-dense sentences of biomedical articles."
+
+SPECIES = ['E. coli', 'S. aureus', 'B. subtilis', 'M. tuberculosis', 'P. aeruginosa', 'C. albicans', 'H. pylori']
+ROUNDS = 3
+
+
+class Search(object):
+    """Make a ``$``-anchored `pattern` match like its reversed copy, by searching forward (the previous way)."""
+
+    def __init__(self, pattern, method='search'):
+        self.method = getattr(pattern, method)
+
+    def match(self, text, pos=0, endpos=None):
+        return self.method(text, pos, len(text) if endpos is None else endpos)
+
+
+FORWARD = {
+    'STRUCTURAL_ABBREVIATIONS_SUFFIX': Search(segmenter.STRUCTURAL_ABBREVIATIONS),
+    'ENDS_IN_DATE_DIGITS_SUFFIX': Search(segmenter.ENDS_IN_DATE_DIGITS),
+    'BEFORE_LOWER_SUFFIX': Search(segmenter.BEFORE_LOWER, 'match'),
+    'MIDDLE_INITIAL_END_SUFFIX': Search(segmenter.MIDDLE_INITIAL_END),
+    'UPPER_CASE_END_SUFFIX': Search(segmenter.UPPER_CASE_END),
+}
+"The forward searches that replace the reversed patterns in the comparison."
+
+
+def corpora(size, seed=42):
+    """Return the texts of about `size` chars by name: articles, and one long list of species names."""
+    rng = random.Random(seed)
+    sentences, length = [], 0
+
+    while length < size:
+        sentences.append(rng.choice(SNIPPETS))
+        length += len(sentences[-1]) + 1
+
+    # every "X. name" joins onto the sentence before it, so the whole list becomes one sentence
+    names = ['Strains of'] + [rng.choice(SPECIES) for _ in range(size // 10)]
+    return {'articles': ' '.join(sentences), 'species list': ' and '.join(names) + ' were tested.'}
+
+
+def timed(text):
+    """Return the best time of :data:`ROUNDS` multi-line segmentations of the `text` and its sentences."""
+    best = None
+
+    for _ in range(ROUNDS):
+        start = default_timer()
+        sentences = list(segmenter.split_multi(text))
+        seconds = default_timer() - start
+        best = seconds if best is None else min(best, seconds)
+
+    return best, sentences
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='10K,100K,1M', help='comma-separated corpus sizes [%(default)s]')
+    args = parser.parse_args()
+    suffix = {name: getattr(segmenter, name) for name in FORWARD}
+    print('%-14s %10s %10s %10s %8s' % ('corpus', 'size', 'suffix', 'forward', 'speedup'))
+
+    for size in [parse_size(s) for s in args.sizes.split(',')]:
+        for name, text in sorted(corpora(size).items()):
+            fast, expected = timed(text)
+
+            for attr, pattern in FORWARD.items():
+                setattr(segmenter, attr, pattern)
+
+            try:
+                slow, sentences = timed(text)
+            finally:
+                for attr, pattern in suffix.items():
+                    setattr(segmenter, attr, pattern)
+
+            assert sentences == expected, name
+            print('%-14s %10d %9.3fs %9.3fs %7.1fx' % (name, len(text), fast, slow, slow / fast))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Differential check and benchmark of the ASCII fast path of the regex-based tokenizers.
+
+Tokenizes a mixed (ASCII and Unicode) corpus with and without the fast path, fails if any
+tokenizer output differs, and reports the time taken by either path.
+"""
+from __future__ import print_function, unicode_literals
+
+import os
+import random
+import sys
+from argparse import ArgumentParser
+from timeit import default_timer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tokenizer  # noqa: E402
+
+SNIPPETS = [
+    'The patient was seen at 12:30pm', 'i.e.', 'e.g.', 'U.S.', 'Dr.', 'vs.', "don't", "Fred's", "boys'",
+    'www.ex-ample.com', 'EC1.2.3.4.5', 'a,b', 'Na 140,', 'K 4.1;', 'Cl:', 'Hel-\r\n lo', 'A-\nB', '...',
+    '(see above)', '"quoted"', '[1]', 'x@y.com', 'http://a.b/c?d=e#f', '&amp;', '&lt;tag&gt;', '5\'-ACGT-3\'',
+    '\x1c', '\x1f', '\t', '\v', '\f', '!', '?', '.', ',', ':', ';', '-', '_', '/',
+    # Unicode (the corpus lines containing these take the regular path)
+    'café', 'H₂O', 'km²', 'Fred’s', '5′-ACGT', '中文', ' ', ' ',
+]
+TOKENIZERS = ['space_tokenizer', 'symbol_tokenizer', 'word_tokenizer', 'web_tokenizer', 'word_tokenizer_spans']
+
+
+def make_corpus(size, seed=42):
+    """Generate `size` random sentences from :data:`SNIPPETS`, most of them pure ASCII."""
+    rng = random.Random(seed)
+    ascii_snippets = [s for s in SNIPPETS if tokenizer._is_ascii(s)]
+    corpus = []
+
+    for _ in range(size):
+        snippets = ascii_snippets if rng.random() < 0.95 else SNIPPETS
+        corpus.append(''.join(
+            rng.choice(snippets) + rng.choice(' \n') for _ in range(rng.randint(1, 30))
+        ))
+
+    return corpus
+
+
+def run(corpus, name):
+    """Tokenize the `corpus` with the tokenizer `name`; return the output and the time taken."""
+    fn = getattr(tokenizer, name)
+    start = default_timer()
+    output = [fn(sentence) for sentence in corpus]
+    return output, default_timer() - start
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=20000, help='number of sentences in the corpus [%(default)s]')
+    args = parser.parse_args()
+    corpus = make_corpus(args.size)
+    is_ascii = tokenizer._is_ascii
+    failed = False
+    print('%-22s %10s %10s %8s' % ('tokenizer', 'fast', 'regular', 'speedup'))
+
+    for name in TOKENIZERS:
+        fast, fast_time = run(corpus, name)
+        tokenizer._is_ascii = lambda text: False
+
+        try:
+            regular, regular_time = run(corpus, name)
+        finally:
+            tokenizer._is_ascii = is_ascii
+
+        print('%-22s %9.3fs %9.3fs %7.2fx' % (name, fast_time, regular_time, regular_time / fast_time))
+
+        for sentence, expected, actual in zip(corpus, regular, fast):
+            if expected != actual:
+                print('MISMATCH for %r: expected %r, got %r' % (sentence, expected, actual), file=sys.stderr)
+                failed = True
+                break
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Benchmark of the table-driven :func:`tokenizer.symbol_tokenizer` against the two-pass regex path.
+
+The regex path first splits on spaces and then runs the alphanumeric split on each span,
+while the table path classifies all characters with a single :meth:`str.translate` and finds
+the symbol runs in one pass; The ASCII fast path is shown for comparison. Example::
+
+    python benchmarks/character_classes.py --lines 2000 --rounds 5
+"""
+from __future__ import print_function, unicode_literals
+
+import os
+import sys
+from argparse import ArgumentParser
+from timeit import default_timer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tokenizer  # noqa: E402
+
+CORPORA = {
+    'unicode': 'Le café coûte 3€ à Zürich. H₂O and CO₂ at 25 °C, 4 km² or 3 m³. Straße – naïve façade — '
+               '«quote». Ελληνικά κείμενα, русский текст; 中文句子。\n',
+    'mostly-ascii': 'The patient (67 y/o) was seen at 12:30pm; BP 120/80, HR 72 – stable.\n',
+    'ascii': 'The patient (67 y/o) was seen at 12:30pm; BP 120/80, HR 72 - stable.\n',
+}
+LINES = 2000
+ROUNDS = 5
+
+
+def regex_path(sentence):
+    """The previous, two-pass regex implementation of the symbol tokenizer."""
+    return [token for span in tokenizer.space_tokenizer(sentence)
+            for token in tokenizer.symbol_tokenizer.automaton.split(span) if token]
+
+
+def timed(function, lines, rounds=ROUNDS):
+    """Return the best time of `rounds` runs of the `function` over all `lines`."""
+    best = None
+
+    for _ in range(rounds):
+        start = default_timer()
+
+        for line in lines:
+            function(line)
+
+        seconds = default_timer() - start
+        best = seconds if best is None else min(best, seconds)
+
+    return best
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--lines', type=int, default=LINES, help='number of lines per corpus [%(default)s]')
+    parser.add_argument('--rounds', type=int, default=ROUNDS, help='runs per path; the best is reported [%(default)s]')
+    args = parser.parse_args()
+    start = default_timer()
+    tokenizer.character_classes()
+    print('character class table loaded in %.1f ms (from %s)' % (
+        (default_timer() - start) * 1e3, tokenizer.CHARACTER_CLASSES_CACHE))
+    print('%-14s %10s %10s %8s' % ('corpus', 'table', 'regex', 'speedup'))
+
+    for name, line in sorted(CORPORA.items()):
+        lines = [line * (1 + i % 5) for i in range(args.lines)]
+
+        for sentence in lines[:5]:
+            assert tokenizer.symbol_tokenizer(sentence) == regex_path(sentence), sentence
+
+        table = timed(tokenizer.symbol_tokenizer, lines, args.rounds)
+        regex = timed(regex_path, lines, args.rounds)
+        print('%-14s %9.3fs %9.3fs %7.2fx' % (name, table, regex, regex / table))
+
+
+if __name__ == '__main__':
+    main()
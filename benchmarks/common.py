@@ -0,0 +1,22 @@
+"""
+Helpers shared by the benchmark scripts, which import this module from their own directory.
+"""
+from __future__ import unicode_literals
+
+UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+"""The multipliers of the size suffixes."""
+
+
+def parse_size(size):
+    """
+    Parse a size like ``1K``, ``10M``, or ``512`` into a number of characters.
+
+    >>> parse_size('1.5k'), parse_size('2M'), parse_size(' 512 ')
+    (1536, 2097152, 512)
+    """
+    size = size.strip().upper()
+
+    if size[-1] in UNITS:
+        return int(float(size[:-1]) * UNITS[size[-1]])
+
+    return int(size)
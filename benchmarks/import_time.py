@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+Cold-start benchmark of importing the tokenizer and segmenter modules.
+
+Each measurement runs in a fresh interpreter and compares the (lazy) import alone to
+the import followed by :func:`patterns.warmup`, which is what an eager import used to cost.
+"""
+from __future__ import print_function
+
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMER = """
+from timeit import default_timer
+start = default_timer()
+import regex  # the regex module itself is not lazy
+import_regex = default_timer()
+import {module}
+import_module = default_timer()
+import patterns
+patterns.warmup()
+print(import_module - import_regex, default_timer() - import_regex)
+"""
+
+
+def measure(module, runs):
+    """Return the median lazy and eager import times of the `module` in seconds."""
+    lazy, eager = [], []
+
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', TIMER.format(module=module)], cwd=ROOT)
+        times = output.split()
+        lazy.append(float(times[0]))
+        eager.append(float(times[1]))
+
+    return sorted(lazy)[runs // 2], sorted(eager)[runs // 2]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=15, help='number of fresh interpreters per module [%(default)s]')
+    runs = parser.parse_args().runs
+    print('%-10s %10s %10s %10s' % ('module', 'lazy ms', 'eager ms', 'saved'))
+
+    for module in ('segmenter', 'tokenizer'):
+        lazy, eager = measure(module, runs)
+        print('%-10s %10.2f %10.2f %9.0f%%' % (module, lazy * 1e3, eager * 1e3, 100 * (1 - lazy / eager)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Scaling benchmark of the paragraph-parallel multi-line segmentation across 1 to N cores.
+
+A large document of many paragraphs is segmented with :func:`segmenter.split_multi_spans` and with
+:func:`segmenter.split_multi_spans_parallel` in pools of 1 to N worker processes; the sentence offsets
+must come out the same. The speedup is relative to the serial segmentation. Example::
+
+    python benchmarks/parallel_paragraphs.py --size 16M --chunk-size 1M --workers 8
+"""
+from __future__ import division, print_function, unicode_literals
+
+import os
+import random
+import sys
+from argparse import ArgumentParser
+from multiprocessing import cpu_count
+from timeit import default_timer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import segmenter  # noqa: E402
+from common import parse_size  # noqa: E402
+
+SENTENCES = [
+    'Mice (n = 12; cf. Fig. 2A) were treated i.v. with 5 mg/kg, i.e. the dose used by Smith et al. in 2010.',
+    'As reported by Dr. Jones, the effect was strong.',
+    'Was it?',
+    'The U.S. samples were collected on 3 Jan. 2005 and stored at -80 degrees.',
+    'It rained all day; the sun came out\nin the evening, when we went home.',
+    'Results are shown in Table 2 (see also [12]).',
+]
+"Sentences to build paragraphs from."
+
+HEADINGS = ['Introduction', 'Methods', 'Results', '2.1 Samples', 'Discussion']
+"Paragraphs without a sentence terminal."
+
+ROUNDS = 3
+
+
+def document(size, seed=42):
+    """Return a document of about `size` chars, made of headings and paragraphs separated by blank lines."""
+    rng = random.Random(seed)
+    paragraphs, length = [], 0
+
+    while length < size:
+        if rng.random() < 0.1:
+            paragraphs.append(rng.choice(HEADINGS))
+        else:
+            paragraphs.append(' '.join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 8))))
+
+        length += len(paragraphs[-1]) + 2
+
+    return '\n\n'.join(paragraphs)
+
+
+def timed(function, *args, **kwargs):
+    """Return the best time of :data:`ROUNDS` calls of the `function` and its (listed) result."""
+    best = None
+
+    for _ in range(ROUNDS):
+        start = default_timer()
+        result = list(function(*args, **kwargs))
+        seconds = default_timer() - start
+        best = seconds if best is None else min(best, seconds)
+
+    return best, result
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', default='16M', help='document size [%(default)s]')
+    parser.add_argument('--chunk-size', default='1M', help='minimum size of the text per job [%(default)s]')
+    parser.add_argument('--workers', type=int, default=cpu_count(), help='maximum number of processes [%(default)s]')
+    args = parser.parse_args()
+    text = document(parse_size(args.size))
+    chunk_size = parse_size(args.chunk_size)
+    cuts = len(list(segmenter._paragraph_cuts(text, chunk_size, segmenter.DEFAULT_ABBREVIATIONS)))
+    serial, expected = timed(segmenter.split_multi_spans, text)
+    print('%d chars, %d sentences, %d jobs; serial: %.3fs' % (len(text), len(expected), cuts + 1, serial))
+    print('%7s %10s %8s %10s' % ('workers', 'time', 'speedup', 'efficiency'))
+
+    for workers in range(1, args.workers + 1):
+        seconds, spans = timed(segmenter.split_multi_spans_parallel, text, workers=workers, chunk_size=chunk_size)
+        assert spans == expected, workers
+        print('%7d %9.3fs %7.2fx %9.0f%%' % (workers, seconds, serial / seconds, 100 * serial / seconds / workers))
+
+
+if __name__ == '__main__':
+    main()
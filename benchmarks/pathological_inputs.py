@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Worst-case latency of the word and web tokenizers on pathological inputs, with and without protected mode.
+
+Each input is one long, unbroken span of the given size (base64 blobs, DNA, minified URLs, ...)
+embedded in a short sentence. Without a timeout, the "formula" input makes the token pattern
+backtrack quadratically; In protected mode, its latency is bounded by a few timeouts. Example::
+
+    python benchmarks/pathological_inputs.py --size 50000 --timeout 0.1
+"""
+from __future__ import print_function, unicode_literals
+
+import base64
+import os
+import random
+import sys
+from argparse import ArgumentParser
+from timeit import default_timer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tokenizer  # noqa: E402
+
+
+def inputs(size, seed=42):
+    """Return the pathological spans of about `size` characters by name."""
+    rng = random.Random(seed)
+    blob = base64.b64encode(bytes(bytearray(rng.getrandbits(8) for _ in range(size * 3 // 4)))).decode('ascii')
+    return {
+        'base64': blob,
+        'dna': ''.join(rng.choice('ACGT') for _ in range(size)),
+        'url': 'http://ex.com/' + '/'.join('p%d.js?a=%d-b' % (i, i) for i in range(size // 12)),
+        'dotted': '.'.join('a1' for _ in range(size // 3)),
+        'hyphenated': '-'.join('Ab' for _ in range(size // 3)),
+        'formula': 'Ab' * (size // 2) + 'x',
+    }
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=50000, help='length of the pathological spans [%(default)s]')
+    parser.add_argument('--timeout', type=float, default=tokenizer.PROTECTED_TIMEOUT,
+                        help='regex timeout of the protected mode in seconds [%(default)s]')
+    args = parser.parse_args()
+    print('%-12s %-15s %12s %12s %10s' % ('input', 'tokenizer', 'plain sec', 'protected', 'fallbacks'))
+
+    for name, span in sorted(inputs(args.size).items()):
+        sentence = 'This is %s, the end.' % span
+
+        for function in (tokenizer.word_tokenizer, tokenizer.web_tokenizer):
+            start = default_timer()
+            function(sentence)
+            plain = default_timer() - start
+
+            tokenizer.FALLBACKS.clear()
+            start = default_timer()
+            function(sentence, timeout=args.timeout)
+            protected = default_timer() - start
+            print('%-12s %-15s %12.3f %12.3f %10d' % (
+                name, function.__name__, plain, protected, sum(tokenizer.FALLBACKS.values())))
+
+
+if __name__ == '__main__':
+    main()
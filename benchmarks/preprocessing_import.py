@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""
+Cold-start benchmark of importing the preprocessing module: time and peak resident memory (RSS).
+
+Each measurement runs in a fresh interpreter and compares the (lazy) import alone to the import
+followed by :func:`preprocessing.warmup`, which loads all resources, as the import used to.
+The preprocessing module is part of the package, so it is imported from the parent directory.
+"""
+from __future__ import division, print_function
+
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(ROOT)
+
+MEASURE = """
+import resource
+import sys
+from timeit import default_timer
+sys.path[:0] = [{root!r}, {parent!r}]
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = default_timer()
+from {package} import preprocessing
+imported = default_timer()
+import_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+preprocessing.warmup()
+print(imported - start, default_timer() - start, import_rss - rss, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss)
+"""
+
+
+def measure(runs):
+    """Return the median lazy and eager import times (in seconds) and peak RSS increases (in KiB)."""
+    script = MEASURE.format(root=ROOT, parent=os.path.dirname(ROOT), package=PACKAGE)
+    samples = []
+
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', script], cwd=os.path.dirname(ROOT))
+        samples.append([float(value) for value in output.split()[-4:]])
+
+    return [sorted(column)[runs // 2] for column in zip(*samples)]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help='number of fresh interpreters [%(default)s]')
+    runs = parser.parse_args().runs
+    lazy, eager, lazy_rss, eager_rss = measure(runs)
+    print('%-8s %10s %10s' % ('import', 'ms', 'RSS MiB'))
+    print('%-8s %10.1f %10.1f' % ('lazy', lazy * 1e3, lazy_rss / 1024))
+    print('%-8s %10.1f %10.1f' % ('eager', eager * 1e3, eager_rss / 1024))
+    print('saved %.0f%% of the time and %.0f%% of the memory' % (
+        100 * (1 - lazy / eager), 100 * (1 - lazy_rss / eager_rss) if eager_rss else 0
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Benchmark of a compiled :class:`preprocessing.PreprocessingPipeline` against chaining the functions by hand.
+
+All run the same steps on a batch of short clinical texts, and must produce the same results: The original
+chain, with its nine ``re.sub`` calls to normalize a text; The current functions, chained by hand; And the
+pipeline, which merges the adjacent single char substitutions into one pass. Example::
+
+    python benchmarks/preprocessing_pipeline.py --size 100000
+"""
+from __future__ import division, print_function, unicode_literals
+
+import os
+import random
+import re
+import sys
+from argparse import ArgumentParser
+from timeit import default_timer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import preprocessing  # noqa: E402
+
+TEXTS = [
+    'Aspirin (ASA) & Ibuprofen [NSAID]*',
+    'Heart-rate: 80, BP 120/80 {sitting}',
+    'Pt. c/o chest pain ~2h, SpO2 93% @ rest',
+    'Type 2 diabetes + hypertension (controlled)',
+    'Fever & chills?  No   rash.',
+]
+"Short texts with brackets, punctuation, and ampersands."
+
+STEPS = [
+    'normalize',
+    ('remove_punctuations', {'keep_apostrophe': False}),
+    'change_case',
+    'remove_inner_blanks',
+]
+"The benchmarked pipeline steps; They need no external resources."
+
+ROUNDS = 3
+
+
+def original(texts):
+    """Apply the :data:`STEPS` to the `texts` as the preprocessing functions originally did."""
+    results = []
+
+    for text in texts:
+        text = re.sub(r'\}', '', text)
+        text = re.sub(r'\{', '', text)
+        text = re.sub(r'\(.*\)', '', text)
+        text = re.sub(r'\(', '', text)
+        text = re.sub(r'\)', '', text)
+        text = re.sub(r'\[', '', text)
+        text = re.sub(r'\]', '', text)
+        text = re.sub(r'\+', '', text)
+        text = re.sub(r' \& ', ' and ', text)
+        text = re.sub(r'[^a-zA-Z0-9,&]', r' ', text)
+        text = text.lower().strip()
+        results.append(' '.join([word.strip() for word in text.split(' ') if word.strip() != '']))
+
+    return results
+
+
+def chained(texts):
+    """Apply the :data:`STEPS` to the `texts` by calling the preprocessing functions one after the other."""
+    results = []
+
+    for text in texts:
+        text = preprocessing.normalize(text)
+        text = preprocessing.remove_punctuations(text, keep_apostrophe=False)
+        text = preprocessing.change_case(text)
+        results.append(preprocessing.remove_inner_blanks(text))
+
+    return results
+
+
+def timed(function, texts):
+    """Return the best time of :data:`ROUNDS` calls of the `function` on the `texts` and its result."""
+    best = None
+
+    for _ in range(ROUNDS):
+        start = default_timer()
+        result = function(texts)
+        seconds = default_timer() - start
+        best = seconds if best is None else min(best, seconds)
+
+    return best, result
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=100000, help='number of texts in the batch [%(default)s]')
+    args = parser.parse_args()
+    rng = random.Random(42)
+    texts = [rng.choice(TEXTS) for _ in range(args.size)]
+    pipeline = preprocessing.PreprocessingPipeline(STEPS)
+    baseline, expected = timed(original, texts)
+    print('%d texts, %d pipeline passes' % (len(texts), len(pipeline.steps)))
+    print('%-10s %10s %8s' % ('chain', 'time', 'speedup'))
+    print('%-10s %9.3fs %7.2fx' % ('original', baseline, 1))
+
+    for name, function in [('chained', chained), ('pipeline', pipeline.process_batch)]:
+        seconds, results = timed(function, texts)
+        assert results == expected, name
+        print('%-10s %9.3fs %7.2fx' % (name, seconds, baseline / seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+"""
+Benchmark of the sentence segmenter, with a golden-output regression check.
+
+The bundled corpora in ``corpora/segmenter`` cover abbreviation-heavy biomedical text, author lists,
+bracketed citations, European dates, and hard-wrapped text. Every paragraph of a corpus is one
+document, in three line break variants: Unix (as is), Windows (``\\r\\n``), and Unicode (U+2028).
+For every function, corpus, and size, the suite reports the throughput in sentences/sec and the
+latency percentiles of the single calls. Examples::
+
+    python benchmarks/segmenter_suite.py --sizes 10K,1M --output results.json
+    python benchmarks/segmenter_suite.py --check
+    python benchmarks/segmenter_suite.py --update-golden
+
+The check segments all the documents and compares the output to ``corpora/segmenter/golden.json``;
+It exits with status 1 on any difference, so a rewrite of the segmenter can be validated as
+preserving its behaviour. Only update the golden output for intended changes of the segmentation.
+"""
+from __future__ import division, print_function, unicode_literals
+
+import io
+import json
+import os
+import platform
+import random
+import sys
+from argparse import ArgumentParser
+from timeit import default_timer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPORA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpora', 'segmenter')
+GOLDEN = os.path.join(CORPORA, 'golden.json')
+sys.path.insert(0, ROOT)
+
+import segmenter  # noqa: E402
+from common import parse_size  # noqa: E402
+
+LINE_BREAKS = {'unix': '\n', 'windows': '\r\n', 'unicode': '\u2028'}
+"""The line break variants of the documents."""
+
+FUNCTIONS = {
+    'split_single': lambda text: list(segmenter.split_single(text)),
+    'split_multi': lambda text: list(segmenter.split_multi(text)),
+    'split_multi_join_on_lowercase': lambda text: list(segmenter.split_multi(text, join_on_lowercase=True)),
+    'rewrite_do_not_cross_lines': lambda text: list(
+        segmenter.rewrite_line_separators(text, segmenter.DO_NOT_CROSS_LINES)
+    ),
+    'rewrite_may_cross_one_line': lambda text: list(
+        segmenter.rewrite_line_separators(text, segmenter.MAY_CROSS_ONE_LINE)
+    ),
+}
+"""The checked and benchmarked functions by name: each returns a list of strings for a (Unix) text."""
+
+
+def corpora():
+    """Return the names of the bundled corpora."""
+    return sorted(name[:-4] for name in os.listdir(CORPORA) if name.endswith('.txt'))
+
+
+def read_corpus(corpus, line_break='unix'):
+    """Return the text of the `corpus`, with the `line_break` variant of its line breaks."""
+    with io.open(os.path.join(CORPORA, corpus + '.txt'), encoding='utf-8', newline='') as fp:
+        return fp.read().replace('\n', LINE_BREAKS[line_break])
+
+
+def documents(corpus, line_break='unix'):
+    """Return the paragraphs of the `corpus`, with the `line_break` variant of their line breaks."""
+    separator = LINE_BREAKS[line_break] * 2
+    return [paragraph for paragraph in read_corpus(corpus, line_break).split(separator) if paragraph.strip()]
+
+
+def segment(function, document):
+    """Return the output of the `function` (name) for a `document`, after normalizing its line breaks."""
+    return FUNCTIONS[function](segmenter.to_unix_linebreaks(document))
+
+
+def golden_output():
+    """
+    Return the output of all functions on all documents, and on the whole corpus as the last document,
+    keyed by corpus, line break variant, and function.
+    """
+    return {
+        '%s/%s' % (corpus, line_break): {
+            function: [segment(function, document) for document in
+                       documents(corpus, line_break) + [read_corpus(corpus, line_break)]]
+            for function in sorted(FUNCTIONS)
+        } for corpus in corpora() for line_break in sorted(LINE_BREAKS)
+    }
+
+
+def differences(output, golden):
+    """Yield a description of every document whose `output` differs from the `golden` output."""
+    for key in sorted(set(golden) | set(output)):
+        for function in sorted(set(golden.get(key, {})) | set(output.get(key, {}))):
+            expected = golden.get(key, {}).get(function)
+            actual = output.get(key, {}).get(function)
+
+            if expected is None or actual is None:
+                yield '%s %s: %s' % (key, function, 'not in the golden output' if expected is None else 'missing')
+                continue
+
+            for number, (wanted, got) in enumerate(zip(expected, actual)):
+                if wanted != got:
+                    yield '%s %s, document %d:\n  expected %r\n  actual   %r' % (key, function, number, wanted, got)
+
+            if len(expected) != len(actual):
+                yield '%s %s: %d documents, expected %d' % (key, function, len(actual), len(expected))
+
+
+def make_corpus(corpus, line_break, size, seed=42):
+    """Sample the documents of the `corpus` into a list of documents totalling `size` characters."""
+    paragraphs = documents(corpus, line_break)
+    rng = random.Random(seed)
+    inputs, length = [], 0
+
+    while length < size:
+        inputs.append(rng.choice(paragraphs))
+        length += len(inputs[-1])
+
+    return inputs
+
+
+def percentile(ordered, pct):
+    """Return the `pct` percentile of the `ordered` values (nearest rank)."""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def measure(function, inputs):
+    """Call the `function` (name) on all `inputs`; return the sentences, time, and (sorted) latencies."""
+    latencies = []
+    sentences = 0
+    start = default_timer()
+
+    for document in inputs:
+        call = default_timer()
+        sentences += len(segment(function, document))
+        latencies.append(default_timer() - call)
+
+    seconds = default_timer() - start
+    latencies.sort()
+    return sentences, seconds, latencies
+
+
+def run(names, corpus_names, line_breaks, sizes):
+    """Run the benchmarks and return the list of result records."""
+    results = []
+
+    for corpus in corpus_names:
+        for line_break in line_breaks:
+            for size in sizes:
+                inputs = make_corpus(corpus, line_break, size)
+
+                for name in names:
+                    sentences, seconds, latencies = measure(name, inputs)
+                    results.append({
+                        'function': name,
+                        'corpus': corpus,
+                        'line_breaks': line_break,
+                        'size': size,
+                        'calls': len(inputs),
+                        'sentences': sentences,
+                        'seconds': seconds,
+                        'sentences_per_sec': sentences / seconds if seconds else None,
+                        'latency_us': {
+                            'p50': percentile(latencies, 50) * 1e6,
+                            'p90': percentile(latencies, 90) * 1e6,
+                            'p99': percentile(latencies, 99) * 1e6,
+                            'max': latencies[-1] * 1e6,
+                        },
+                    })
+                    print('%-30s %-15s %-8s %10d %12.0f sent/s  p50 %8.1f us  p99 %8.1f us' % (
+                        name, corpus, line_break, size, results[-1]['sentences_per_sec'] or 0,
+                        results[-1]['latency_us']['p50'], results[-1]['latency_us']['p99']
+                    ), file=sys.stderr)
+
+    return results
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--functions', default=','.join(sorted(FUNCTIONS)),
+                        help='comma-separated functions to benchmark [%(default)s]')
+    parser.add_argument('--corpora', default=','.join(corpora()),
+                        help='comma-separated bundled corpora [%(default)s]')
+    parser.add_argument('--line-breaks', default=','.join(sorted(LINE_BREAKS)),
+                        help='comma-separated line break variants [%(default)s]')
+    parser.add_argument('--sizes', default='10K,100K,1M',
+                        help='comma-separated corpus sizes [%(default)s]')
+    parser.add_argument('--output', '-o', metavar='JSON', help='write the results to this file')
+    parser.add_argument('--check', action='store_true',
+                        help='only compare the output of the segmenter to the golden output')
+    parser.add_argument('--update-golden', action='store_true',
+                        help='only write the current output of the segmenter as the golden output')
+    args = parser.parse_args()
+
+    if args.update_golden:
+        with io.open(GOLDEN, 'w', encoding='utf-8') as fp:
+            fp.write(json.dumps(golden_output(), indent=1, sort_keys=True, ensure_ascii=False) + '\n')
+
+        return
+
+    if args.check:
+        with io.open(GOLDEN, encoding='utf-8') as fp:
+            failed = list(differences(golden_output(), json.load(fp)))
+
+        for difference in failed:
+            print(difference, file=sys.stderr)
+
+        print('%d differences to the golden output' % len(failed), file=sys.stderr)
+
+        if failed:
+            sys.exit(1)
+
+        return
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': run(args.functions.split(','), args.corpora.split(','), args.line_breaks.split(','),
+                       [parse_size(s) for s in args.sizes.split(',')]),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Scaling benchmark of the segmenter command-line tool on long runs of text without any sentence boundary.
+
+The tool reads its input in blocks and carries the text over until no more text can change the last
+sentence, so a single line without a sentence terminal stays in the carry-over buffer to the end;
+The time per MB must stay (roughly) constant as the run grows. Each size is written to ``--files``
+files, which are segmented in a fresh process per line (the default) or per paragraph (``-m``),
+serially or in the ``--jobs`` mode that segments each file in a worker; The output must be the
+input line of every file. Example::
+
+    python benchmarks/stream_no_boundary.py --sizes 1M,4M,16M --files 4
+"""
+from __future__ import division, print_function, unicode_literals
+
+import io
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from argparse import ArgumentParser
+from timeit import default_timer
+
+from common import parse_size
+
+SEGMENTER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'segmenter.py')
+WORDS = ['alpha', 'beta', 'gamma', 'delta', 'e.g', 'x', '(see', 'Fig', '2)', 'i.e', 'et', 'al']
+"Words to build a line from: none ends with a sentence terminal."
+
+MODES = {'single': [], 'multi': ['-m'], 'jobs': ['--jobs', '2'], 'multi-jobs': ['-m', '--jobs', '2']}
+"""The segmenter options of each benchmarked mode."""
+
+
+def line(size, seed=42):
+    """Return a line of `size` chars, made of :data:`WORDS` separated by spaces."""
+    rng = random.Random(seed)
+    words, length = [], 0
+
+    while length < size:
+        words.append(rng.choice(WORDS))
+        length += len(words[-1]) + 1
+
+    return ' '.join(words)[:size].strip()
+
+
+def timed(options, paths):
+    """Return the time that the segmenter takes for the files at `paths` with the `options`, and its output."""
+    start = default_timer()
+    output = subprocess.check_output([sys.executable, SEGMENTER] + options + paths)
+    return default_timer() - start, output.decode('utf-8')
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='1M,4M,16M', help='comma-separated lengths of the line [%(default)s]')
+    parser.add_argument('--modes', default=','.join(sorted(MODES)),
+                        help='comma-separated segmenter modes [%(default)s]')
+    parser.add_argument('--files', type=int, default=2, help='number of input files per size [%(default)s]')
+    args = parser.parse_args()
+    directory = tempfile.mkdtemp()
+    print('%-10s %10s %10s %10s' % ('mode', 'chars', 'seconds', 'ms/MB'))
+
+    try:
+        for size in [parse_size(s) for s in args.sizes.split(',')]:
+            text = line(size)
+            paths = [os.path.join(directory, 'line%d.txt' % number) for number in range(args.files)]
+
+            for path in paths:
+                with io.open(path, 'w', encoding='utf-8') as fp:
+                    fp.write(text)
+
+            for mode in args.modes.split(','):
+                seconds, output = timed(MODES[mode], paths)
+                # the multi-line output has no newline after the last sentence of a file
+                assert output == (text if '-m' in MODES[mode] else text + '\n') * args.files, mode
+                print('%-10s %10d %10.3f %10.1f' % (
+                    mode, len(text), seconds, seconds * 1e3 / (len(text) * args.files / 2 ** 20)
+                ))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
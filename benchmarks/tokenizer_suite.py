@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+"""
+Benchmark suite for the tokenizers, with JSON reports and a throughput regression gate.
+
+Each profile generates one-sentence-per-line corpora of increasing size that stress a different
+edge case of the tokenizers. For every tokenizer, profile, and size, the suite reports the
+throughput in tokens/sec, the peak memory allocated (via :mod:`tracemalloc`), and the latency
+percentiles of the single calls. Examples::
+
+    python benchmarks/tokenizer_suite.py --sizes 1K,1M --output results.json
+    python benchmarks/tokenizer_suite.py --save-baseline baseline.json
+    python benchmarks/tokenizer_suite.py --baseline baseline.json --max-regression 10
+
+All patterns are compiled and the character class table is loaded before measuring; Each measurement
+starts with an untimed pass, and the fastest of its timed repeats counts.
+With a baseline, the suite exits with status 1 if the throughput of any measurement that also
+is in the baseline dropped by more than the maximum regression percentage.
+"""
+from __future__ import division, print_function, unicode_literals
+
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from functools import partial
+from timeit import default_timer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPORA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpora')
+sys.path.insert(0, ROOT)
+
+import patterns  # noqa: E402
+import tokenizer  # noqa: E402
+from common import parse_size  # noqa: E402
+
+REPEATS = 3
+
+SNIPPETS = {
+    'prose': [
+        'The quick brown fox jumps over the lazy dog.', 'She said: "Hello there!"', 'It rained (a lot) today.',
+        'Is this the right way?', 'We met Dr. Smith, i.e. the surgeon, at 5 p.m. yesterday.',
+    ],
+    'punctuation': [
+        'Na 140, K 4.1, Cl 101; HCO3 24,', 'a,b,c,d,e,f,', '1,2,3; 4:5, 6;;', 'x:, y;, z,,,', 'a, b: c; d,',
+    ],
+    'web': [
+        'See http://example.com/path?q=1#top for details.', 'Mail jane.doe@example.org, please.',
+        'Tom &amp; Jerry &lt;3 &#39;quotes&#39;', '<a href="https://x.org/a">link</a>', 'www.ex-ample.com.',
+    ],
+    'unicode': [
+        'Le café coûte 3€ à Zürich.', 'H₂O and CO₂ at 25 °C, 4 km² or 3 m³.', 'Straße – naïve façade — «quote».',
+        '中文句子。日本語の文。', 'Fred’s 5′-ACGT-3′ primer.',
+    ],
+    'contractions': [
+        "I don't think he'll come, but we'd've asked.", "The boys' toys and Fred's car aren't here.",
+        "You're right: it's the dogs' bowl.", "They've said we can't; she'd said I'm late.", "James' book's cover.",
+    ],
+    'hyphenated': [
+        'The inter-\nnational stand-\r\n ard was re-\n  evaluated.', 'A well-known, state-of-the-art, long-\nterm fix.',
+        'Co-\n operation and pre-\nprocessing', 'DNA 5\'-ACGT-3\' and EC1.2.3.4-\n5', 'x-\n y-\n z',
+    ],
+}
+"""Sentence snippets of the synthetic profiles: each stresses a different edge case."""
+
+TOKENIZERS = ['space_tokenizer', 'symbol_tokenizer', 'word_tokenizer', 'web_tokenizer']
+SPLITTERS = ['split_contractions', 'split_possessive_markers']
+
+
+def profiles():
+    """Return the names of all profiles: the synthetic ones and one per bundled corpus file."""
+    bundled = sorted(name[:-4] for name in os.listdir(CORPORA) if name.endswith('.txt'))
+    return sorted(SNIPPETS) + bundled
+
+
+def make_corpus(profile, size, seed=42):
+    """Generate a list of (one-per-line) sentences of the `profile` totalling `size` characters."""
+    if profile in SNIPPETS:
+        snippets = SNIPPETS[profile]
+    else:
+        with io.open(os.path.join(CORPORA, profile + '.txt'), encoding='utf-8') as fp:
+            snippets = [line.rstrip('\n') for line in fp if line.strip()]
+
+    rng = random.Random(seed)
+    lines, length = [], 0
+
+    while length < size:
+        line = ' '.join(rng.choice(snippets) for _ in range(rng.randint(1, 3))) + '\n'
+        lines.append(line)
+        length += len(line)
+
+    return lines
+
+
+def copy_lists(lists):
+    """Return a list of copies of the `lists`."""
+    return [list(items) for items in lists]
+
+
+def percentile(ordered, pct):
+    """Return the `pct` percentile of the `ordered` values (nearest rank)."""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def warmup():
+    """Compile all lazy patterns and load the character class table, so that no measurement pays for them."""
+    patterns.warmup()
+    tokenizer.character_classes()
+
+
+def measure(function, make_inputs, memory=True, repeats=REPEATS):
+    """
+    Call the `function` on all inputs, once untimed and then `repeats` times;
+    Return the tokens, time, and latencies of the fastest repeat, and the peak memory.
+
+    :param make_inputs: a function that returns the inputs (fresh copies, if the `function` changes them)
+    """
+    for item in make_inputs():
+        function(item)
+
+    best = None
+
+    for _ in range(repeats):
+        inputs = make_inputs()
+        latencies = []
+        tokens = 0
+        start = default_timer()
+
+        for item in inputs:
+            call = default_timer()
+            tokens += len(function(item))
+            latencies.append(default_timer() - call)
+
+        seconds = default_timer() - start
+
+        if best is None or seconds < best[1]:
+            best = tokens, seconds, latencies
+
+    tokens, seconds, latencies = best
+    peak = None
+
+    if memory:
+        inputs = make_inputs()
+        tracemalloc.start()
+
+        for item in inputs:
+            function(item)
+
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    latencies.sort()
+    return tokens, seconds, latencies, peak
+
+
+def run(names, profile_names, sizes, memory=True, repeats=REPEATS):
+    """Run the benchmarks and return the list of result records."""
+    results = []
+
+    for profile in profile_names:
+        for size in sizes:
+            lines = make_corpus(profile, size)
+            tokenized = None
+
+            for name in names:
+                if name in SPLITTERS:
+                    if tokenized is None:
+                        tokenized = [tokenizer.word_tokenizer(line) for line in lines]
+
+                    # the splitters update the token lists in place: always benchmark on fresh copies
+                    make_inputs = partial(copy_lists, tokenized)
+                else:
+                    make_inputs = partial(list, lines)
+
+                tokens, seconds, latencies, peak = measure(getattr(tokenizer, name), make_inputs, memory, repeats)
+                results.append({
+                    'tokenizer': name,
+                    'profile': profile,
+                    'size': size,
+                    'calls': len(lines),
+                    'tokens': tokens,
+                    'seconds': seconds,
+                    'tokens_per_sec': tokens / seconds if seconds else None,
+                    'peak_memory_bytes': peak,
+                    'latency_us': {
+                        'p50': percentile(latencies, 50) * 1e6,
+                        'p90': percentile(latencies, 90) * 1e6,
+                        'p99': percentile(latencies, 99) * 1e6,
+                        'max': latencies[-1] * 1e6,
+                    },
+                })
+                print('%-25s %-14s %10d %12.0f tok/s  p99 %8.1f us' % (
+                    name, profile, size, results[-1]['tokens_per_sec'] or 0, results[-1]['latency_us']['p99']
+                ), file=sys.stderr)
+
+    return results
+
+
+def regressions(results, baseline, max_regression):
+    """Return the results whose throughput dropped more than `max_regression` percent below the `baseline`."""
+    key = lambda r: (r['tokenizer'], r['profile'], r['size'])  # noqa: E731
+    expected = {key(r): r['tokens_per_sec'] for r in baseline['results']}
+    failed = []
+
+    for result in results:
+        reference = expected.get(key(result))
+
+        if reference and result['tokens_per_sec'] is not None:
+            drop = 100 * (1 - result['tokens_per_sec'] / reference)
+
+            if drop > max_regression:
+                failed.append((result, reference, drop))
+
+    return failed
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tokenizers', default=','.join(TOKENIZERS + SPLITTERS),
+                        help='comma-separated tokenizers and splitters to benchmark [%(default)s]')
+    parser.add_argument('--profiles', default=','.join(profiles()),
+                        help='comma-separated corpus profiles [%(default)s]')
+    parser.add_argument('--sizes', default='1K,10K,100K,1M',
+                        help='comma-separated corpus sizes, up to e.g. 100M [%(default)s]')
+    parser.add_argument('--no-memory', action='store_true', help='skip the (slow) peak memory measurement')
+    parser.add_argument('--repeats', type=int, default=REPEATS,
+                        help='number of timed repeats of each measurement, of which the fastest counts [%(default)s]')
+    parser.add_argument('--output', '-o', metavar='JSON', help='write the results to this file')
+    parser.add_argument('--save-baseline', metavar='JSON', help='write the results as the new baseline')
+    parser.add_argument('--baseline', metavar='JSON', help='compare the throughput to this baseline')
+    parser.add_argument('--max-regression', metavar='PCT', type=float, default=10.0,
+                        help='maximum allowed throughput drop below the baseline in percent [%(default)s]')
+    args = parser.parse_args()
+    warmup()
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': run(args.tokenizers.split(','), args.profiles.split(','),
+                       [parse_size(s) for s in args.sizes.split(',')], memory=not args.no_memory,
+                       repeats=args.repeats),
+    }
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as fp:
+                json.dump(report, fp, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as fp:
+            failed = regressions(report['results'], json.load(fp), args.max_regression)
+
+        for result, reference, drop in failed:
+            print('REGRESSION %s on %s (%d chars): %.0f tok/s is %.1f%% below the baseline %.0f tok/s' % (
+                result['tokenizer'], result['profile'], result['size'], result['tokens_per_sec'], drop, reference
+            ), file=sys.stderr)
+
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
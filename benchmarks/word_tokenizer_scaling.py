@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Scaling benchmark for the :func:`tokenizer.word_tokenizer` on document-sized, comma-heavy input.
+
+Tokenizes CSV-like lab value lists of doubling size (16 KB to 1 MB by default) and reports the time
+per KB; With linear-time post-processing, the time per KB must stay (roughly) constant. Example::
+
+    python benchmarks/word_tokenizer_scaling.py --min-size 16K --max-size 4M
+"""
+from __future__ import print_function
+
+import os
+import sys
+from argparse import ArgumentParser
+from timeit import default_timer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tokenizer import word_tokenizer  # noqa: E402
+from common import parse_size  # noqa: E402
+
+LINE = 'Na 140, K 4.1, Cl 101; HCO3 24, BUN 12, Cr 0.9: glucose 98, a,b; 1,2,3,\n'
+"""A comma-, semi-colon-, and colon-heavy (lab value list) line."""
+
+
+def sizes(smallest, largest):
+    """Return the input sizes in bytes: doubling from `smallest` as long as they do not exceed `largest`."""
+    result = [smallest]
+
+    while result[-1] * 2 <= largest:
+        result.append(result[-1] * 2)
+
+    return result
+
+
+def make_text(size):
+    """Repeat :data:`LINE` until the text is `size` characters long."""
+    return (LINE * (size // len(LINE) + 1))[:size]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--min-size', default='16K', help='size of the smallest input [%(default)s]')
+    parser.add_argument('--max-size', default='1M', help='maximum size of the largest input [%(default)s]')
+    args = parser.parse_args()
+    inputs = sizes(parse_size(args.min_size), parse_size(args.max_size))
+    print('%10s %10s %10s %12s' % ('bytes', 'tokens', 'seconds', 'us/KB'))
+    per_kb = []
+
+    for size in inputs:
+        text = make_text(size)
+        start = default_timer()
+        tokens = word_tokenizer(text)
+        seconds = default_timer() - start
+        per_kb.append(seconds * 1e6 / (size / 1024.0))
+        print('%10d %10d %10.4f %12.2f' % (size, len(tokens), seconds, per_kb[-1]))
+
+    print('growth of us/KB from %d KB to %d KB: %.2fx' % (
+        inputs[0] // 1024, inputs[-1] // 1024, per_kb[-1] / per_kb[0]))
+
+
+if __name__ == '__main__':
+    main()
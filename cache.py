@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Bounded memoization of the text-processing functions for inputs with heavy repetition.
+
+Wrap any function that takes the text as its first argument, for example::
+
+>>> from tokenizer import word_tokenizer
+>>> tokenize = LRUCache(word_tokenizer, maxsize=10000)
+>>> tokenize("It's a template.")
+("It's", 'a', 'template', '.')
+>>> tokenize("It's a template.")
+("It's", 'a', 'template', '.')
+>>> tokenize.stats()['hits']
+1
+
+The cached results are returned as tuples, so callers cannot mutate them.
+"""
+from __future__ import absolute_import, unicode_literals
+
+from collections import OrderedDict
+from hashlib import sha1
+from threading import Lock
+
+MAX_KEY_LENGTH = 256
+"Inputs longer than this are cached by their SHA-1 digest (and length) instead of the text itself."
+
+
+class LRUCache(object):
+    """
+    A least-recently-used cache of the results of a `function`, for at most `maxsize` inputs.
+
+    The cache can be shared by threads: Its bookkeeping is guarded by a lock, but the `function`
+    is called outside of it, so concurrent misses of the same input may each call the function.
+    """
+
+    def __init__(self, function, maxsize=1024, max_key_length=MAX_KEY_LENGTH):
+        """
+        :param function: the function to cache the results of; takes the text as first argument
+        :param maxsize: the maximum number of cached results
+        :param max_key_length: inputs longer than this are keyed by their digest
+        """
+        if maxsize < 1:
+            raise ValueError('maxsize must be positive, got %r' % maxsize)
+
+        self.function = function
+        self.maxsize = maxsize
+        self.max_key_length = max_key_length
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._results = OrderedDict()
+        self._lock = Lock()
+        self.__doc__ = function.__doc__
+
+    def __call__(self, text, *args, **kwargs):
+        key = self._key(text)
+
+        if args or kwargs:
+            key = (key, args, tuple(sorted(kwargs.items())))
+
+        with self._lock:
+            result = self._results.pop(key, None)
+
+            if result is not None:
+                self.hits += 1
+                self._results[key] = result  # re-insert as the most recently used result
+                return result
+
+            self.misses += 1
+
+        result = tuple(self.function(text, *args, **kwargs))
+
+        with self._lock:
+            # another thread may have inserted the result meanwhile
+            if self._results.pop(key, None) is None and len(self._results) >= self.maxsize:
+                self._results.popitem(last=False)
+                self.evictions += 1
+
+            self._results[key] = result
+
+        return result
+
+    def __len__(self):
+        return len(self._results)
+
+    def _key(self, text):
+        if len(text) <= self.max_key_length:
+            return text
+
+        return len(text), sha1(text.encode('utf-8', 'surrogatepass')).digest()
+
+    def stats(self):
+        """Return the hit, miss, and eviction counters and the current and maximum cache size."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._results),
+            'maxsize': self.maxsize,
+        }
+
+    def clear(self):
+        """Drop all cached results and reset the counters."""
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = self.evictions = 0
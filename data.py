@@ -3,7 +3,7 @@
 import collections
 from typing import Dict, List
 
-from tokenizer import split_contractions, word_tokenizer
+from tokenizer import iter_split_contractions, word_tokenizer
 
 Transformation = collections.namedtuple('Transformation', ['text', 'stage'])
 
@@ -46,7 +46,7 @@ class Sentence:
     def __init__(self, text: str):
         self.tokens: List[Token] = []
         if text is not None:
-            for idx, word in enumerate(split_contractions(word_tokenizer(text))):
+            for idx, word in enumerate(iter_split_contractions(word_tokenizer(text))):
                 self.add_token(Token(word, idx))
 
     def __getitem__(self, token_id: int) -> Token:
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+"""
+Incremental sentence segmentation and tokenization of edited documents.
+
+A :class:`Document` keeps the sentence and token offsets of a text up to date while the text gets
+edited, for example in an annotation UI::
+
+>>> doc = Document('It rained. The sun came out.')
+>>> [doc.text[start:end] for start, end in doc.sentences]
+['It rained.', 'The sun came out.']
+>>> doc.edit(9, 1, ', and then')
+(0, 2, 1)
+>>> doc.tokens(0)
+['It', 'rained', ',', 'and', 'then', 'The', 'sun', 'came', 'out', '.']
+
+Each edit only re-segments and re-tokenizes a small window of sentences around the edited
+text, so its cost is proportional to the size of the edit, not the size of the document.
+"""
+from __future__ import absolute_import, unicode_literals
+
+from bisect import bisect_left, bisect_right
+from sys import maxsize
+
+try:
+    from .segmenter import split_multi_spans, split_single_spans, DEFAULT_ABBREVIATIONS, SHORT_SENTENCE_LENGTH
+    from .tokenizer import word_tokenizer_spans
+except ImportError:
+    # if used as command-line tool
+    # noinspection PyUnresolvedReferences
+    from segmenter import split_multi_spans, split_single_spans, DEFAULT_ABBREVIATIONS, SHORT_SENTENCE_LENGTH
+    # noinspection PyUnresolvedReferences
+    from tokenizer import word_tokenizer_spans
+
+
+class Document(object):
+    """
+    A text with the offsets of its (non-blank) sentences and of the tokens in each sentence.
+
+    The sentences are ``(start, end)`` offsets into the :attr:`text`, in order; The token offsets
+    of each sentence are relative to the start of that sentence, so that an edit does not have to
+    shift the offsets of all the tokens after it.
+    """
+
+    def __init__(self, text, multi=True, tokenizer=word_tokenizer_spans, sentences=None, token_spans=None,
+                 join_on_lowercase=False, short_sentence_length=SHORT_SENTENCE_LENGTH,
+                 abbreviations=DEFAULT_ABBREVIATIONS):
+        """
+        :param text: the text of the document
+        :param multi: segment with :func:`segmenter.split_multi` if true, else :func:`segmenter.split_single`
+        :param tokenizer: a span mode tokenizer, like :func:`tokenizer.word_tokenizer_spans`
+        :param sentences: the previous sentence offsets of the `text`, to not segment it again
+                          (if not `multi`, the text still is segmented into its :attr:`units`)
+        :param token_spans: the previous (relative) token offsets of those `sentences`
+        :param join_on_lowercase: see :func:`segmenter.split_multi`
+        :param short_sentence_length: see :func:`segmenter.split_multi`
+        :param abbreviations: see :func:`segmenter.split_multi`
+        """
+        self.text = text
+        self.multi = multi
+        self.tokenizer = tokenizer
+        self.join_on_lowercase = join_on_lowercase
+        self.short_sentence_length = short_sentence_length
+        self.abbreviations = abbreviations
+        #: The offsets of the (non-blank) sentences before they are split at newlines (if not `multi`):
+        #: Edits are checked against these, as they only depend on the text around them.
+        self.units = self._segment(0, len(text)) if sentences is None or not multi else list(sentences)
+
+        if sentences is None:
+            sentences = self._split_lines(self.units)
+
+        if token_spans is None:
+            token_spans = [self.tokenizer(text[start:end]) for start, end in sentences]
+
+        self.sentences = self.units if multi else list(sentences)
+        self.token_spans = list(token_spans)
+
+    def tokens(self, sentence):
+        """Return the token strings of the `sentence` (its index)."""
+        text = self.text[self.sentences[sentence][0]:self.sentences[sentence][1]]
+        return [text[start:end] for start, end in self.token_spans[sentence]]
+
+    def spans(self, sentence):
+        """Return the ``(start, end)`` offsets of the tokens of the `sentence` in the :attr:`text`."""
+        offset = self.sentences[sentence][0]
+        return [(start + offset, end + offset) for start, end in self.token_spans[sentence]]
+
+    def edit(self, offset, deleted=0, inserted=''):
+        """
+        Replace `deleted` characters at the `offset` with the `inserted` text and update the offsets.
+
+        The affected window of sentences, plus one unchanged sentence on either side, is segmented
+        again, with one more sentence on either side as context; If those unchanged sentences do not
+        come out the same, the window is widened until they do. (If not multi, these are the :attr:`units`,
+        and the sentences of the new units replace those of the old ones.)
+
+        :param offset: the offset of the edit in the current text
+        :param deleted: the number of characters deleted at the `offset`
+        :param inserted: the text inserted at the `offset`
+        :returns: the index of the first changed sentence, the number of sentences it replaced,
+                  and the number of sentences that replaced them
+        """
+        old = self.text
+        end_of_edit = offset + deleted
+
+        if not 0 <= offset <= end_of_edit <= len(old):
+            raise ValueError('edit of %d chars at %d outside the text' % (deleted, offset))
+
+        self.text = old[:offset] + inserted + old[end_of_edit:]
+        delta = len(inserted) - deleted
+        units = self.units
+        total = len(units)
+        # the units before the edit (and one more), up to the first unit after it (and one more)
+        first = max(0, bisect_left(units, (offset,)) - 2)
+        last = min(total, bisect_right(units, (end_of_edit, maxsize)) + 1)
+
+        while True:
+            # the units just before and after the window only serve as context
+            start = units[first - 1][0] if first else 0
+            end = units[last][1] + delta if last < total else len(self.text)
+            window = self._segment(start, end)
+            head = units[first] if first else None
+            tail = (units[last - 1][0] + delta, units[last - 1][1] + delta) if last < total else None
+
+            if head is not None and head not in window:
+                first -= 1
+            elif tail is not None and tail not in window:
+                last += 1
+            else:
+                break
+
+        window = window[window.index(head) if head else 0:window.index(tail) + 1 if tail else len(window)]
+
+        if not self.multi:
+            # the sentences of the replaced units start at or after the start of the first one
+            sentences = self.sentences
+            first_sentence = bisect_left(sentences, (units[first][0],)) if first < total else len(sentences)
+            last_sentence = bisect_left(sentences, (units[last][0],)) if last < total else len(sentences)
+            self._replace(units, first, last, window, delta)
+            first, last, window = first_sentence, last_sentence, self._split_lines(window)
+
+        self._replace(self.sentences, first, last, window, delta)
+        self.token_spans[first:last] = [self.tokenizer(self.text[start:end]) for start, end in window]
+        return first, last - first, len(window)
+
+    @staticmethod
+    def _replace(spans, first, last, window, delta):
+        """Replace the `spans` from `first` to `last` with the `window` and shift the spans after it by `delta`."""
+        if delta:
+            spans[last:] = [(start + delta, end + delta) for start, end in spans[last:]]
+
+        spans[first:last] = window
+
+    def _segment(self, start, end):
+        """Segment the text from `start` to `end` and return the offsets of its non-blank sentences."""
+        text = self.text[start:end]
+
+        if self.multi:
+            spans = split_multi_spans(text, self.join_on_lowercase, self.short_sentence_length, self.abbreviations)
+        else:
+            spans = split_single_spans(text, self.join_on_lowercase, self.short_sentence_length, self.abbreviations,
+                                       lines=False)
+
+        return [(start + first, start + last) for first, last in spans if text[first:last].strip()]
+
+    def _split_lines(self, units):
+        """Return the offsets of the (non-blank) sentences of the `units`: if not multi, split at newlines."""
+        if self.multi:
+            return units
+
+        text = self.text
+        sentences = []
+
+        for start, end in units:
+            for line in text[start:end].split('\n'):
+                if line.strip():
+                    sentences.append((start, start + len(line)))
+
+                start += len(line) + 1
+
+        return sentences
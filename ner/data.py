@@ -11,10 +11,19 @@ from os.path import isfile, join
 from enum import Enum
 from collections import Counter
 from collections import defaultdict
+from functools import partial
 
-from segtok.segmenter import split_single
-from segtok.tokenizer import split_contractions
-from segtok.tokenizer import word_tokenizer
+try:
+    from ..segmenter import split_multi_spans, split_single_spans
+    from ..tokenizer import (INDEX_SUFFIX, iter_split_contraction_spans, token_index, tokenize_many,
+                             word_tokenizer_with_spans)
+except ImportError:
+    # if used with the repository root on the path
+    # noinspection PyUnresolvedReferences
+    from segmenter import split_multi_spans, split_single_spans
+    # noinspection PyUnresolvedReferences
+    from tokenizer import (INDEX_SUFFIX, iter_split_contraction_spans, token_index, tokenize_many,
+                           word_tokenizer_with_spans)
 
 
 class Dictionary:
@@ -55,6 +64,13 @@ class Dictionary:
         else:
             return 0
 
+    def get_str_item2idx(self) -> Dict[str, int]:
+        """
+        returns the mapping of (decoded) strings to IDs, to look up many strings without encoding each
+        :return: dictionary of strings to IDs
+        """
+        return {item.decode('UTF-8'): idx for item, idx in self.item2idx.items()}
+
     def get_items(self) -> List[str]:
         items = []
         for item in self.idx2item:
@@ -71,17 +87,21 @@ class Dictionary:
 class Token:
     """
     This class represents one word in a tokenized sentence. Each token may have any number of tags. It may also point
-    to its head in a dependency tree.
+    to its head in a dependency tree. Tokens produced by the tokenizer know their character offsets in the source text.
     """
 
     def __init__(self,
                  text: str,
                  idx: int = None,
-                 head_id: int = None
+                 head_id: int = None,
+                 start_pos: int = None,
+                 end_pos: int = None
                  ):
         self.text: str = text
         self.idx: int = idx
         self.head_id: int = head_id
+        self.start_pos: int = start_pos
+        self.end_pos: int = end_pos
 
         self.sentence: Sentence = None
         self._embeddings: Dict = {}
@@ -135,17 +155,14 @@ class Sentence:
 
             # tokenize the text first if option selected, otherwise assumes whitespace tokenized text
             if use_tokenizer:
-                sentences = split_single(text)
-                tokens = []
-                for sentence in sentences:
-                    contractions = split_contractions(word_tokenizer(sentence))
-                    tokens.extend(contractions)
-
-                text = ' '.join(tokens)
-
-            # add each word in tokenized string as Token object to Sentence
-            for word in text.split(' '):
-                self.add_token(Token(word))
+                # segment and tokenize in one pass, keeping the character offsets of the tokens in the text
+                for tokens in tokenize_document(text):
+                    for word, start, end in tokens:
+                        self.add_token(Token(word, start_pos=start, end_pos=end))
+            else:
+                # add each word in tokenized string as Token object to Sentence
+                for word in text.split(' '):
+                    self.add_token(Token(word))
 
     def __getitem__(self, token_id: int) -> Token:
         return self.get_token(token_id)
@@ -250,7 +267,7 @@ class Sentence:
     def __copy__(self):
         s = Sentence()
         for token in self.tokens:
-            nt = Token(token.text)
+            nt = Token(token.text, start_pos=token.start_pos, end_pos=token.end_pos)
             for tag_type in token.tags:
                 nt.add_tag(tag_type, token.get_tag(tag_type))
 
@@ -267,6 +284,75 @@ class Sentence:
         return len(self.tokens)
 
 
+def tokenize_document(text: str, multi: bool = False, split_contractions: bool = True) -> List[List[tuple]]:
+    """
+    Segment a document into sentences once and tokenize each sentence span once.
+    :param text: the document text
+    :param multi: segment with split_multi (sentences may cross single newlines) instead of split_single
+    :param split_contractions: split off contractions like "n't" and "'ll" into tokens of their own
+    :return: for each non-empty sentence, its (token, start, end) triples with character offsets into the text
+    """
+    split = split_multi_spans if multi else split_single_spans
+    sentences = []
+
+    for offset, end in split(text):
+        tokens = word_tokenizer_with_spans(text[offset:end])
+
+        if split_contractions:
+            tokens = iter_split_contraction_spans(tokens)
+
+        tokens = [(word, offset + start, offset + stop) for word, start, stop in tokens]
+
+        if tokens:
+            sentences.append(tokens)
+
+    return sentences
+
+
+def document_to_sentences(text: str, multi: bool = False, split_contractions: bool = True) -> List[Sentence]:
+    """
+    Build one Sentence per sentence of a document, with Tokens that know their character offsets in the document.
+    :param text: the document text
+    :param multi: see tokenize_document
+    :param split_contractions: see tokenize_document
+    :return: the sentences of the document
+    """
+    return _build_sentences(tokenize_document(text, multi, split_contractions))
+
+
+def documents_to_sentences(texts, multi: bool = False, split_contractions: bool = True, workers: int = None,
+                           chunksize: int = 16):
+    """
+    Build the Sentences of a batch of documents (see document_to_sentences), segmenting and tokenizing the
+    documents in a pool of worker processes. Only the compact token triples are sent back from the workers;
+    The Sentence and Token objects are built in the calling process.
+    :param texts: an iterable of document texts
+    :param multi: see tokenize_document
+    :param split_contractions: see tokenize_document
+    :param workers: the number of worker processes (default: number of CPUs); if 1, no pool is used
+    :param chunksize: the number of documents sent to a worker at a time
+    :return: a generator of the sentence lists, in the order of the documents
+    """
+    worker = partial(tokenize_document, multi=multi, split_contractions=split_contractions)
+
+    for sentences in tokenize_many(texts, worker, workers=workers, chunksize=chunksize):
+        yield _build_sentences(sentences)
+
+
+def _build_sentences(sentences: List[List[tuple]]) -> List[Sentence]:
+    result: List[Sentence] = []
+
+    for tokens in sentences:
+        sentence = Sentence()
+
+        for word, start, end in tokens:
+            sentence.add_token(Token(word, start_pos=start, end_pos=end))
+
+        result.append(sentence)
+
+    return result
+
+
 class TaggedCorpus:
     def __init__(self, train: List[Sentence], dev: List[Sentence], test: List[Sentence]):
         self.train: List[Sentence] = train
@@ -739,14 +825,17 @@ class NLPTaskDataFetcher:
 
 
 class CorpusLM(object):
-    def __init__(self, path, dictionary: Dictionary, forward: bool = True, character_level: bool = True):
+    def __init__(self, path, dictionary: Dictionary, forward: bool = True, character_level: bool = True,
+                 tokenizer: str = None):
         self.dictionary: Dictionary = dictionary
         self.train_path = os.path.join(path, 'train')
         self.train = None
         self.forward = forward
         self.split_on_char = character_level
+        # word level only: read the tokens of this tokenizer from token indexes instead of splitting on spaces
+        self.tokenizer = tokenizer
 
-        self.train_files = sorted([f for f in listdir(self.train_path) if isfile(join(self.train_path, f))])
+        self.train_files = sorted(self.list_train_files())
         self.current_train_file = None
 
         if forward:
@@ -760,6 +849,11 @@ class CorpusLM(object):
             self.test = self.charsplit(os.path.join(path, 'test.txt'), expand_vocab=False, forward=False,
                                        split_on_char=self.split_on_char)
 
+    def list_train_files(self) -> List[str]:
+        """The files in the train directory, except for the token indexes that index_split writes next to them."""
+        return [f for f in listdir(self.train_path)
+                if isfile(join(self.train_path, f)) and not f.endswith(INDEX_SUFFIX)]
+
     def get_next_train_slice(self) -> str:
 
         if self.current_train_file == None:
@@ -778,8 +872,7 @@ class CorpusLM(object):
         return self.current_train_file
 
     def get_random_train_slice(self) -> str:
-        train_files = [f for f in listdir(self.train_path) if isfile(join(self.train_path, f))]
-        current_train_file = random.choice(train_files)
+        current_train_file = random.choice(self.list_train_files())
         self.train = self.charsplit(os.path.join(self.train_path, current_train_file), expand_vocab=False,
                                     forward=self.forward, split_on_char=self.split_on_char)
         return current_train_file
@@ -789,6 +882,9 @@ class CorpusLM(object):
         """Tokenizes a text file on characted basis."""
         assert os.path.exists(path)
 
+        if not split_on_char and self.tokenizer is not None:
+            return self.index_split(path, expand_vocab=expand_vocab, forward=forward)
+
         #
         with open(path, 'r', encoding="utf-8") as f:
             tokens = 0
@@ -844,6 +940,29 @@ class CorpusLM(object):
 
         return ids
 
+    def index_split(self, path: str, expand_vocab=False, forward=True) -> torch.LongTensor:
+        """Reads the tokens of a text file from its token index, which only is built on the first pass."""
+        index = token_index(path, self.tokenizer)
+
+        try:
+            if expand_vocab:
+                for tokens in index:
+                    for word in tokens:
+                        self.dictionary.add_item(word)
+
+            ids = torch.LongTensor(index.num_tokens)
+            token, step = (0, 1) if forward else (index.num_tokens - 1, -1)
+
+            for tokens in index:
+                # change the case of the whole line at once, like charsplit does
+                for word in self.random_casechange('\n'.join(tokens)).split('\n') if tokens else ():
+                    ids[token] = self.dictionary.get_idx_for_item(word)
+                    token += step
+        finally:
+            index.close()
+
+        return ids
+
     def random_casechange(self, line: str) -> str:
         no = randint(0, 99)
         if no is 0:
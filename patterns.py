@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+A registry of lazily compiled regular expressions.
+
+The tokenizer and segmenter define their automata with :func:`compile` from this module,
+so that importing them does not compile any patterns:
+Each pattern is only compiled when it is first used.
+Long-running processes that prefer to pay the compilation cost up front can call :func:`warmup`.
+"""
+from __future__ import absolute_import, unicode_literals
+
+from regex import REVERSE, compile as compile_regex
+
+REGISTRY = []
+"All lazy patterns created by :func:`compile`, in order of their creation."
+
+
+class LazyPattern(object):
+    """
+    A regular expression `pattern` that is compiled with its `flags` on first use.
+
+    Any attribute of the compiled pattern (``match``, ``split``, ``groups``, etc.) is available
+    on the lazy pattern, too; After the first lookup, it is cached as an attribute of this instance.
+    """
+
+    def __init__(self, pattern, flags=0):
+        self._pattern = pattern
+        self._flags = flags
+        self._automaton = None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        value = getattr(self.compile(), name)
+        setattr(self, name, value)
+        return value
+
+    def __repr__(self):
+        return 'LazyPattern(%r, %d)' % (self._pattern, self._flags)
+
+    @property
+    def compiled(self):
+        """Whether the pattern has been compiled already."""
+        return self._automaton is not None
+
+    def compile(self):
+        """Compile the pattern (if not compiled yet) and return the compiled automaton."""
+        if self._automaton is None:
+            self._automaton = compile_regex(self._pattern, self._flags)
+
+        return self._automaton
+
+    def reversed(self):
+        """
+        Return a new lazy pattern that matches backwards, from the end of the string:
+        Its ``match`` method anchors the (usually ``$``-terminated) pattern at the end of the string.
+        """
+        return compile(self._pattern, self._flags | REVERSE)
+
+
+def compile(pattern, flags=0):
+    """A lazy replacement for :func:`regex.compile` that registers the returned pattern."""
+    lazy = LazyPattern(pattern, flags)
+    REGISTRY.append(lazy)
+    return lazy
+
+
+def warmup():
+    """Compile all registered patterns that have not been compiled yet."""
+    for lazy in REGISTRY:
+        lazy.compile()
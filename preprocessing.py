@@ -1,35 +1,148 @@
 # coding: utf-8
-"""Text Preprocessor."""
+"""
+Text Preprocessor.
+
+The spell checker, lemmatizer, stemmer, inflect engine, stop words, and apostrophe replacements are
+loaded on first use, by the accessor functions below, so importing this module is cheap:
+A script that only wants :func:`remove_inner_blanks` does not read or train on any data files.
+Servers that prefer to pay the loading cost up front can call :func:`warmup`.
+"""
 import os
 import pickle
 import re
+from functools import partial
+from threading import Lock
 
-from nltk.stem import WordNetLemmatizer
-from nltk.stem.porter import PorterStemmer
-
-import inflect
 from segmenter import split_single
 
-from .spell.SweetingSpellCheck import SweetingSpellCheck
-
 this_dir = os.path.dirname(__file__)
 
-sweetingSpellCheck = SweetingSpellCheck()
-lemmas = WordNetLemmatizer()
-stemmer = PorterStemmer()
-inflectengine = inflect.engine()
-final_stop_words = []
+PUNCTUATIONS = re.compile(r'[?|$|*|%|@|(|)|~|-]')
+"The punctuation chars that :func:`remove_punctuations` replaces, if it keeps apostrophes."
+
+NON_ALPHANUMERICS = re.compile(r'[^a-zA-Z0-9,&]')
+"The chars that :func:`remove_punctuations` replaces, if it does not keep apostrophes."
+
+PARENTHESIZED = re.compile(r'\(.*\)')
+"The text from the first opening to the last closing parenthesis on a line, removed by :func:`normalize`."
+
+BRACKETS = re.compile(r'[{}()\[\]+]')
+"The (remaining) brackets and plus signs, removed by :func:`normalize`."
+
+AMPERSAND = re.compile(r' [{}()\[\]+]*&[{}()\[\]+]* ')
+"A free-standing ampersand (if the :data:`BRACKETS` around it are removed), spelled out by :func:`normalize`."
+
+RESOURCES = []
+"All lazy resources created by :class:`LazyResource`, in order of their creation."
+
+
+class LazyResource(object):
+    """
+    A resource that is created by calling its `load` function on first use.
+
+    Calling the resource returns it; Concurrent first calls from several threads load it only once.
+    """
+
+    def __init__(self, load):
+        self._load = load
+        self._lock = Lock()
+        self._loaded = False
+        self._value = None
+        self.__doc__ = load.__doc__
+        RESOURCES.append(self)
+
+    def __call__(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._value = self._load()
+                    self._loaded = True
+
+        return self._value
+
+    def __repr__(self):
+        return 'LazyResource(%s)' % self._load.__name__
+
+    @property
+    def loaded(self):
+        """Whether the resource has been loaded already."""
+        return self._loaded
+
+
+def warmup():
+    """Load all resources that have not been loaded yet."""
+    for resource in RESOURCES:
+        resource()
+
+
+@LazyResource
+def spell_checker():
+    """The spell checker (trained on the data files when first used)."""
+    from .spell.SweetingSpellCheck import SweetingSpellCheck  # its class body trains the word model
+    return SweetingSpellCheck()
+
 
-with open(os.path.join(this_dir, 'data/stopwords.txt'), 'r') as file:
-    for word in file.readlines():
-        final_stop_words.append(word.strip())
-final_stop_words.remove('and')
-final_stop_words.remove('or')
-final_stop_words.remove('not')
+@LazyResource
+def lemmatizer():
+    """The WordNet lemmatizer."""
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
 
-with open(os.path.join(this_dir, 'data/apostrophe.pkl'), 'rb') as file:
-    appos = pickle.load(file)
-    del appos['cause']
+
+@LazyResource
+def porter_stemmer():
+    """The Porter stemmer."""
+    from nltk.stem.porter import PorterStemmer
+    return PorterStemmer()
+
+
+@LazyResource
+def inflect_engine():
+    """The inflect engine."""
+    import inflect
+    return inflect.engine()
+
+
+@LazyResource
+def stop_words():
+    """The list of stop words, except for 'and', 'or', and 'not'."""
+    final_stop_words = []
+
+    with open(os.path.join(this_dir, 'data/stopwords.txt'), 'r') as file:
+        for word in file.readlines():
+            final_stop_words.append(word.strip())
+    final_stop_words.remove('and')
+    final_stop_words.remove('or')
+    final_stop_words.remove('not')
+    return final_stop_words
+
+
+@LazyResource
+def apostrophes():
+    """The apostrophe replacements (the expansion of each contraction), except for 'cause'."""
+    with open(os.path.join(this_dir, 'data/apostrophe.pkl'), 'rb') as file:
+        appos = pickle.load(file)
+        del appos['cause']
+    return appos
+
+
+LEGACY_NAMES = {
+    'sweetingSpellCheck': spell_checker,
+    'lemmas': lemmatizer,
+    'stemmer': porter_stemmer,
+    'inflectengine': inflect_engine,
+    'final_stop_words': stop_words,
+    'appos': apostrophes,
+}
+"The resources by the names of the module attributes that they used to be loaded into at import."
+
+
+def __getattr__(name):
+    """Load the resources accessed by their former module attribute names (:data:`LEGACY_NAMES`)."""
+    try:
+        return LEGACY_NAMES[name]()
+    except KeyError:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name)) from None
 
 
 def detect_sentence_boundary(text):
@@ -40,16 +153,13 @@ def detect_sentence_boundary(text):
 
 def remove_punctuations(sentence, keep_apostrophe=True):
     """Sanitize string by removing punctuations."""
-    if keep_apostrophe:
-        pattern = r'[?|$|*|%|@|(|)|~|-]'
-    else:
-        pattern = r'[^a-zA-Z0-9,&]'
-    return re.sub(pattern, r' ', sentence)
+    pattern = PUNCTUATIONS if keep_apostrophe else NON_ALPHANUMERICS
+    return pattern.sub(' ', sentence)
 
 
 def spell_check(text: str) -> str:
     """Spell checker."""
-    return sweetingSpellCheck.correct_spell(text)
+    return spell_checker().correct_spell(text)
 
 
 def change_case(text: str, style='lower') -> str:
@@ -73,41 +183,38 @@ def remove_inner_blanks(text: str) -> str:
 
 def lemma(text: str) -> str:
     """Lemmatizer."""
-    return lemmas.lemmatize(text)
+    return lemmatizer().lemmatize(text)
 
 
 def stem(text):
     """Porter stemmer."""
-    return stemmer.stem(text)
+    return porter_stemmer().stem(text)
 
 
 def normalize(text):
     """Normalize the text."""
-    new_text = re.sub('\}', '', text)
-    new_text = re.sub('\{', '', new_text)
-    new_text = re.sub('\(.*\)', '', new_text)
-    new_text = re.sub('\(', '', new_text)
-    new_text = re.sub('\)', '', new_text)
-    new_text = re.sub('\[', '', new_text)
-    new_text = re.sub('\]', '', new_text)
-    new_text = re.sub('\+', '', new_text)
-    new_text = re.sub(' \& ', ' and ', new_text)
-    return new_text
+    # removing the braces before the parenthesized text (as it used to) matches the same parentheses
+    new_text = PARENTHESIZED.sub('', text)
+    new_text = AMPERSAND.sub(' and ', new_text)
+    return BRACKETS.sub('', new_text)
 
 
 def remove_stop_words(text):
     """Remove character not related to alphabets."""
+    final_stop_words = stop_words()
     return ' '.join(
         [word for word in text.split(' ') if word not in final_stop_words])
 
 
 def is_stop_word(word):
     """Change status of the token."""
-    return word in final_stop_words
+    return word in stop_words()
 
 
 def convert_to_singular(text):
     """Convert plural to singular."""
+    inflectengine = inflect_engine()
+
     if inflectengine.singular_noun(text):
         return inflectengine.singular_noun(text).lower()
     else:
@@ -116,7 +223,202 @@ def convert_to_singular(text):
 
 def apostrophe_replacer(text):
     """Remove Apostrophe."""
+    appos = apostrophes()
+
     for apo in appos:
         if text.rfind(apo) != -1:
             text = text.replace(apo, appos[apo].lower())
     return text
+
+
+class Substitution(object):
+    """
+    A precompiled regular expression substitution step of a :class:`PreprocessingPipeline`.
+
+    If the `pattern` only ever matches a single char, regardless of the text around it (like a character
+    class), it is `single_char`, and the pipeline merges it with adjacent single char substitutions.
+    """
+
+    def __init__(self, pattern, replacement, single_char=False):
+        """
+        :param pattern: a regular expression (string or compiled)
+        :param replacement: the replacement string or function, as for :func:`re.sub`
+        :param single_char: whether the pattern only matches single chars, without context
+        """
+        self.pattern = re.compile(pattern)
+        self.replacement = replacement
+        self.single_char = single_char
+
+    def __call__(self, text):
+        return self.pattern.sub(self.replacement, text)
+
+    def __repr__(self):
+        return 'Substitution(%r, %r, single_char=%r)' % (self.pattern.pattern, self.replacement, self.single_char)
+
+    @classmethod
+    def merge(cls, substitutions):
+        """
+        Merge single char `substitutions` into a :class:`CharacterMap`, which substitutes each char as if they were
+        applied in order.
+        """
+        if len(substitutions) == 1:
+            return substitutions[0]
+
+        return CharacterMap(substitutions)
+
+
+class CharacterMap(dict):
+    """
+    A merged run of single char substitution steps of a :class:`PreprocessingPipeline`, applied in one
+    :meth:`str.translate` pass.
+
+    Its table maps each char to the result of applying all the substitutions to the char alone, in order;
+    It is computed the first time the char is translated.
+    """
+
+    def __init__(self, substitutions):
+        """
+        :param substitutions: the single char :class:`Substitution` (or :class:`CharacterMap`) steps in order
+        """
+        super().__init__()
+        self.substitutions = list(substitutions)
+
+    def __missing__(self, code):
+        replacement = chr(code)
+
+        for substitution in self.substitutions:
+            replacement = substitution(replacement)
+
+        self[code] = replacement
+        return replacement
+
+    def __call__(self, text):
+        return text.translate(self)
+
+    def __repr__(self):
+        return 'CharacterMap(%r)' % self.substitutions
+
+
+def _remove_punctuations_steps(keep_apostrophe=True):
+    return [Substitution(PUNCTUATIONS if keep_apostrophe else NON_ALPHANUMERICS, ' ', single_char=True)]
+
+
+def _normalize_steps():
+    return [Substitution(PARENTHESIZED, ''), Substitution(AMPERSAND, ' and '),
+            Substitution(BRACKETS, '', single_char=True)]
+
+
+def _remove_stop_words_steps():
+    final_stop_words = frozenset(stop_words())
+    return [lambda text: ' '.join([word for word in text.split(' ') if word not in final_stop_words])]
+
+
+def _apostrophe_replacer_steps():
+    replacements = [(apo, expansion.lower()) for apo, expansion in apostrophes().items()]
+
+    def replace_apostrophes(text):
+        for apo, expansion in replacements:
+            if apo in text:
+                text = text.replace(apo, expansion)
+        return text
+
+    return [replace_apostrophes]
+
+
+def _function_steps(function, **kwargs):
+    return [partial(function, **kwargs) if kwargs else function]
+
+
+PIPELINE_STEPS = {
+    'normalize': _normalize_steps,
+    'remove_punctuations': _remove_punctuations_steps,
+    'remove_stop_words': _remove_stop_words_steps,
+    'apostrophe_replacer': _apostrophe_replacer_steps,
+    'spell_check': partial(_function_steps, spell_check),
+    'change_case': partial(_function_steps, change_case),
+    'remove_blanks': partial(_function_steps, remove_blanks),
+    'remove_inner_blanks': partial(_function_steps, remove_inner_blanks),
+    'lemma': partial(_function_steps, lemma),
+    'stem': partial(_function_steps, stem),
+    'convert_to_singular': partial(_function_steps, convert_to_singular),
+}
+"The functions that return the (precompiled) steps of the preprocessing functions by name, given their kwargs."
+
+
+class PreprocessingPipeline(object):
+    """
+    An ordered chain of preprocessing steps, compiled once and applied to each text in as few passes as possible.
+
+    >>> pipeline = PreprocessingPipeline(['normalize', 'remove_punctuations', 'change_case', 'remove_inner_blanks'])
+    >>> pipeline.process('Aspirin (ASA) & Ibuprofen [NSAID]*')
+    'aspirin and ibuprofen nsaid'
+    >>> pipeline.process_batch(['Heart-rate: 80', '{Fever} & chills'])
+    ['heart rate: 80', 'fever and chills']
+    """
+
+    def __init__(self, steps):
+        """
+        :param steps: the steps in order, each one of
+                      the name of a preprocessing function of this module (see :data:`PIPELINE_STEPS`);
+                      a tuple of such a name and a dict of its keyword arguments, like
+                      ``('remove_punctuations', {'keep_apostrophe': False})``;
+                      a :class:`Substitution`; Or any function that takes and returns a text
+        """
+        compiled = []
+
+        for step in steps:
+            compiled.extend(self._compile(step))
+
+        self.steps = self._merge(compiled)
+
+    def __repr__(self):
+        return 'PreprocessingPipeline(%r)' % self.steps
+
+    def process(self, text):
+        """Apply all steps to the `text` and return the result."""
+        for step in self.steps:
+            text = step(text)
+        return text
+
+    def process_batch(self, texts):
+        """Apply all steps to each of the `texts` and return the list of results."""
+        results = list(texts)
+
+        for step in self.steps:
+            results = [step(text) for text in results]
+        return results
+
+    @staticmethod
+    def _compile(step):
+        """Return the list of steps that make up a `step` specification."""
+        if isinstance(step, tuple):
+            name, kwargs = step
+        elif isinstance(step, str):
+            name, kwargs = step, {}
+        else:
+            return [step]
+
+        if name not in PIPELINE_STEPS:
+            raise ValueError('unknown preprocessing step %r' % name)
+
+        return PIPELINE_STEPS[name](**kwargs)
+
+    @staticmethod
+    def _merge(steps):
+        """Merge the runs of adjacent single char substitutions into one :class:`CharacterMap` each."""
+        merged = []
+        run = []
+
+        for step in steps + [None]:
+            if isinstance(step, CharacterMap) or isinstance(step, Substitution) and step.single_char:
+                run.append(step)
+                continue
+
+            if run:
+                merged.append(Substitution.merge(run))
+                run = []
+
+            if step is not None:
+                merged.append(step)
+
+        return merged
@@ -30,8 +30,21 @@ Convert the text to Unix linebreaks if the case.
 from __future__ import absolute_import, unicode_literals
 
 import codecs
-
-from regex import DOTALL, UNICODE, VERBOSE, compile
+import io
+import os
+import pickle
+from bisect import bisect_left
+from functools import partial
+from hashlib import sha1
+
+from regex import DOTALL, REVERSE, UNICODE, VERBOSE, escape
+
+try:
+    from .patterns import compile
+except ImportError:
+    # if used as command-line tool
+    # noinspection PyUnresolvedReferences
+    from patterns import compile
 
 __author__ = 'Florian Leitner <florian.leitner@gmail.com>'
 
@@ -48,19 +61,17 @@ HYPHENS = '\u00AD\u058A\u05BE\u0F0C\u1400\u1806\u2010-\u2012\u2e17\u30A0-'
 # Lower-case abbreviations may occur capitalized or not.
 # Only abbreviations that should never occur at the end of a sentence
 # (such as "etc.")
-ABBREVIATIONS = """
-approx Capt cf Col Dr f\.?e figs? Gen e\.?g i\.?e i\.?v
-Mag med Mr Mrs Mt nat No nr p\.e phil prof rer
-sci Sgt Sr Sra Srta St univ vol vs z\.B
+ABBREVIATION_WORDS = """
+approx Capt cf Col Dr f.e fe fig figs Gen e.g eg i.e ie i.v iv
+Mag med Mr Mrs Mt nat No nr p.e phil prof rer
+sci Sgt Sr Sra Srta St univ vol vs z.B
 Jän Jan Ene Feb Mär Mar Apr Abr May Jun Jul Aug Sep Sept Oct Okt Nov Dic Dez Dec
-E\.U U\.K U\.S
+E.U U.K U.S
 """.split()
-ABBREVIATIONS.extend(a.capitalize() for a in ABBREVIATIONS if a[0].islower())
-ABBREVIATIONS = '|'.join(sorted(ABBREVIATIONS))
-ABBREVIATIONS = compile(
-    r"""
-(?: \b(?:%s) # 1. known abbreviations,
-|   ^\S      # 2. a single, non-space character "sentence" (only),
+"The built-in abbreviations (without their final dot) of the :data:`DEFAULT_ABBREVIATIONS` index."
+
+STRUCTURAL_ABBREVIATIONS_REGEX = r"""
+    ^\S      # 2. a single, non-space character "sentence" (only),
 |   ^\d+     # 3. a series of digits "sentence" (only), or
 |   (?: \b   # 4. terminal letters A.-A, A.A, or A, if prefixed with:
     # 4.a. something that makes them most likely a human first name initial
@@ -82,14 +93,36 @@ ABBREVIATIONS = compile(
         [\p{Lu}\p{Lt}] \p{Lm}? \. # optional A.
         [%s]?                     # optional hyphen
     )? [\p{Lu}\p{Lt}] \p{Lm}?     # required A
-) $""" % (ABBREVIATIONS, HYPHENS), UNICODE | VERBOSE
+""" % HYPHENS
+"""
+The rules for candidate sentence ends that are abbreviations by their structure, not their word:
+Single chars, digits, and initials (the alternatives 2.-4. of the ABBREVIATIONS).
+"""
+
+STRUCTURAL_ABBREVIATIONS = compile('(?: %s ) $' % STRUCTURAL_ABBREVIATIONS_REGEX, UNICODE | VERBOSE)
+"Candidate sentence ends that are abbreviations by their structure (see :class:`Abbreviations`)."
+
+ABBREVIATIONS = compile(
+    r"""
+(?: \b(?:%s) # 1. known abbreviations,
+|   %s
+) $""" % ('|'.join(sorted(escape(a) for a in ABBREVIATION_WORDS + [
+        a.capitalize() for a in ABBREVIATION_WORDS if a[0].islower()
+    ])), STRUCTURAL_ABBREVIATIONS_REGEX), UNICODE | VERBOSE
 )
 """
 Common abbreviations at the candidate sentence end that normally don't terminate a sentence.
 Note that a check is required to ensure the potential abbreviation is actually followed by a dot
 and not some other sentence segmentation marker.
+The segmenter itself uses the equivalent :data:`DEFAULT_ABBREVIATIONS` index instead of this pattern.
 """
 
+LAST_WORD = compile(r'\b\w[\w.]*$', UNICODE | REVERSE)
+"The last word of a string, including any dots in it, matched backwards (see :class:`Abbreviations`)."
+
+ABBREVIATION_WORD = compile(r'\w[\w.]*', UNICODE)
+"The abbreviations that a :data:`LAST_WORD` (or a part of it after a dot) can match, without their final dot."
+
 # PMC OA corpus statistics
 # SSs: sentence starters
 # abbrevs: abbreviations
@@ -165,6 +198,19 @@ UPPER_CASE_START = compile(
     r'^(?:(?:\(\d{4}\)\s)?[\p{Lu}\p{Lt}]\p{L}*|\d+)[\.,:]\s+', UNICODE)
 "Inside brackets, 'Words' that can be part of a large abbreviation, like a journal name."
 
+# Reversed copies of the $-anchored patterns: Matching them at the end of a span only looks at the
+# (usually short) suffix they match, while searching for them tries every start position in the span.
+STRUCTURAL_ABBREVIATIONS_SUFFIX = STRUCTURAL_ABBREVIATIONS.reversed()
+"Matches the STRUCTURAL_ABBREVIATIONS at the end of the string, backwards."
+ENDS_IN_DATE_DIGITS_SUFFIX = ENDS_IN_DATE_DIGITS.reversed()
+"Matches ENDS_IN_DATE_DIGITS at the end of the string, backwards."
+BEFORE_LOWER_SUFFIX = BEFORE_LOWER.reversed()
+"Matches BEFORE_LOWER at the end of the string, backwards."
+MIDDLE_INITIAL_END_SUFFIX = MIDDLE_INITIAL_END.reversed()
+"Matches MIDDLE_INITIAL_END at the end of the string, backwards."
+UPPER_CASE_END_SUFFIX = UPPER_CASE_END.reversed()
+"Matches UPPER_CASE_END at the end of the string, backwards."
+
 SHORT_SENTENCE_LENGTH = 55
 "Length of either sentence fragment inside brackets to assume the fragment is not its own sentence."
 # This can be increased/decreased to heighten/lower the likelihood of splits inside brackets.
@@ -200,22 +246,255 @@ DO_NOT_CROSS_LINES = _compile(1)
 MAY_CROSS_ONE_LINE = _compile(2)
 "A segmentation pattern where two or more newline chars also terminate sentences."
 
+MAX_STREAM_BUFFER = 1 << 20
+"""
+The size (in chars) of the carry-over buffer of :func:`split_stream` at which it stops waiting for
+a certain sentence boundary and segments the buffered text as if the stream ended there.
+"""
+
+JOB_BLOCK_SIZE = 1 << 20
+"The minimum size (in chars) of the blocks of STDIN lines that the segmenter CLI sends to each job."
+
+PARAGRAPH_CHUNK_SIZE = 1 << 20
+"The minimum size (in chars) of the runs of paragraphs that :func:`split_multi_parallel` segments per job."
+
+PARAGRAPH_SEPARATOR = compile(r'\n{2,}')
+"Consecutive newline chars, where :func:`split_multi_parallel` may cut the text."
+
+TERMINAL_END = compile(r'[%s][\'\u2019"\u201D]?[\]\)]*$' % SENTENCE_TERMINALS, UNICODE | REVERSE)
+"A sentence terminal with an optional quote and closing brackets at the end of the string, matched backwards."
+
+OPEN_END = compile(r'(?:[%s][\'\u2019"\u201D]?[\]\)]*|\n*)$' % SENTENCE_TERMINALS, UNICODE | REVERSE)
+"The end of a string that might become the start of a separator of the segmenter when more text is appended."
+
+SEPARATOR_GROWTH = {False: compile(r'\s*', UNICODE), True: compile(r'\n*')}
+"The chars that extend a separator of the segmenter at the end of a string, if it is made of newlines or not."
+
+ABBREVIATIONS_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'text_processing', 'abbreviations')
+"""The disk cache directory of the :class:`Abbreviations` indices loaded from files."""
+
+
+class Abbreviations(object):
+    """
+    An index of the abbreviations that do not terminate a sentence when followed by a dot.
+
+    The last word of a candidate sentence end (a run of word characters and dots), or any part of
+    it after one of its dots, is looked up in a set of abbreviations; So, unlike a pattern of all
+    abbreviations, the lookup does not get any slower when more abbreviations are added.
+    Independent of the words, the :data:`STRUCTURAL_ABBREVIATIONS` rules apply, too:
+    single chars, digits, and name initials (for example in author lists).
+
+    Abbreviations are stored without their final dot; Lower-case abbreviations also match when
+    capitalized, while upper-case abbreviations only match as they are. As only words are looked up,
+    abbreviations with other chars (like ``w/o.``) cannot be added.
+    """
+
+    def __init__(self, words=ABBREVIATION_WORDS):
+        """
+        :param words: the abbreviations of the index; a final dot of each abbreviation is ignored
+        """
+        self.words = set()
+        self.update(words)
+
+    def __contains__(self, word):
+        return word in self.words
+
+    def __len__(self):
+        return len(self.words)
+
+    def __repr__(self):
+        return '<Abbreviations of %d words>' % len(self.words)
+
+    def update(self, words):
+        """
+        Add more abbreviations (`words`) to the index; A ValueError is raised (and none of them are added)
+        if any of them is not made of word chars and dots only (see :data:`ABBREVIATION_WORD`).
+        """
+        added = []
+
+        for word in words:
+            word = word.strip()
+
+            if word.endswith('.'):
+                word = word[:-1]
+
+            if word and ABBREVIATION_WORD.fullmatch(word) is None:
+                raise ValueError('abbreviation %r is not a word (with dots) and could never match' % word)
+
+            if word:
+                added.append(word)
+
+        for word in added:
+            self.words.add(word)
+
+            if word[0].islower():
+                self.words.add(word.capitalize())
+
+    def ends_with_abbreviation(self, span):
+        """Check if the `span` of text before a dot ends with an abbreviation."""
+        last = LAST_WORD.match(span)
+
+        if last is not None:
+            word = last.group()
+
+            if word in self.words:
+                return True
+
+            dot = word.find('.')
+
+            while dot != -1:
+                if word[dot + 1:] in self.words:
+                    return True
+
+                dot = word.find('.', dot + 1)
+
+        return STRUCTURAL_ABBREVIATIONS_SUFFIX.match(span) is not None
+
+    @classmethod
+    def load(cls, paths, defaults=True, cache=True):
+        """
+        Load an index of the abbreviations in the files at `paths`.
+
+        The files are UTF-8 text with one abbreviation per line; Blank lines and lines starting with
+        ``#`` are ignored, and a ValueError is raised for an abbreviation that :meth:`update` rejects.
+        The words of the index are cached in :data:`ABBREVIATIONS_CACHE`, keyed by the built-in words
+        (if included) and the paths, sizes, and modification times of the files, so that loading them
+        again is fast.
+
+        :param paths: the file paths
+        :param defaults: include the built-in :data:`ABBREVIATION_WORDS`
+        :param cache: use the disk cache
+        :returns: the new index
+        """
+        paths = [os.path.abspath(path) for path in paths]
+        index = cls(ABBREVIATION_WORDS if defaults else ())
+        key = repr([sorted(ABBREVIATION_WORDS) if defaults else None] +
+                   [(path, os.path.getsize(path), os.path.getmtime(path)) for path in paths])
+        cache_path = os.path.join(ABBREVIATIONS_CACHE, '%s.pickle' % sha1(key.encode('utf-8')).hexdigest())
+
+        if cache:
+            try:
+                with open(cache_path, 'rb') as fp:
+                    index.words = pickle.load(fp)
+
+                return index
+            except (IOError, OSError, EOFError, pickle.UnpicklingError):
+                pass
+
+        for path in paths:
+            with io.open(path, encoding='utf-8') as fp:
+                try:
+                    index.update(line for line in fp if not line.lstrip().startswith('#'))
+                except ValueError as error:
+                    raise ValueError('%s: %s' % (path, error))
+
+        if cache:
+            _save_abbreviations(cache_path, index.words)
+
+        return index
+
+
+def _save_abbreviations(path, words):
+    """Try to cache the `words` of an index on disk; The cache is optional, so any failure is ignored."""
+    temporary = '%s.%d' % (path, os.getpid())
 
-def split_single(text, join_on_lowercase=False, short_sentence_length=SHORT_SENTENCE_LENGTH):
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+
+        with open(temporary, 'wb') as fp:
+            pickle.dump(words, fp, 2)
+
+        os.rename(temporary, path)
+    except (IOError, OSError):
+        pass
+
+
+DEFAULT_ABBREVIATIONS = Abbreviations()
+"The index of the built-in :data:`ABBREVIATION_WORDS`, used unless the segmenter is given another one."
+
+
+def split_single(text, join_on_lowercase=False, short_sentence_length=SHORT_SENTENCE_LENGTH,
+                 abbreviations=DEFAULT_ABBREVIATIONS):
     """
     Default: split `text` at sentence terminals and at newline chars.
     """
-    sentences = _sentences(DO_NOT_CROSS_LINES.split(
-        text), join_on_lowercase, short_sentence_length)
-    return [s for ss in sentences for s in ss.split('\n')]
+    spans = split_single_spans(text, join_on_lowercase, short_sentence_length, abbreviations)
+    return [text[start:end] for start, end in spans]
 
 
-def split_multi(text, join_on_lowercase=False, short_sentence_length=SHORT_SENTENCE_LENGTH):
+def split_multi(text, join_on_lowercase=False, short_sentence_length=SHORT_SENTENCE_LENGTH,
+                abbreviations=DEFAULT_ABBREVIATIONS):
     """
     Sentences may contain non-consecutive (single) newline chars, while consecutive newline chars
     ("paragraph separators") always split sentences.
     """
-    return _sentences(MAY_CROSS_ONE_LINE.split(text), join_on_lowercase, short_sentence_length)
+    spans = split_multi_spans(text, join_on_lowercase, short_sentence_length, abbreviations)
+    return (text[start:end] for start, end in spans)
+
+
+def split_single_spans(text, join_on_lowercase=False, short_sentence_length=SHORT_SENTENCE_LENGTH,
+                       abbreviations=DEFAULT_ABBREVIATIONS, lines=True):
+    """
+    Like :func:`split_single`, but return the ``(start, end)`` offsets of the sentences in the `text`.
+
+    If not `lines`, the sentences are not split at the newline chars inside them.
+    """
+    sentences = _sentences(text, DO_NOT_CROSS_LINES, join_on_lowercase, short_sentence_length, abbreviations)
+
+    if not lines:
+        return list(sentences)
+
+    return [line for start, end in sentences for line in _lines(text, start, end)]
+
+
+def split_multi_spans(text, join_on_lowercase=False, short_sentence_length=SHORT_SENTENCE_LENGTH,
+                      abbreviations=DEFAULT_ABBREVIATIONS):
+    """
+    Like :func:`split_multi`, but yield the ``(start, end)`` offsets of the sentences in the `text`.
+    """
+    return _sentences(text, MAY_CROSS_ONE_LINE, join_on_lowercase, short_sentence_length, abbreviations)
+
+
+def split_multi_parallel(text, join_on_lowercase=False, short_sentence_length=SHORT_SENTENCE_LENGTH,
+                         abbreviations=DEFAULT_ABBREVIATIONS, workers=None, chunk_size=PARAGRAPH_CHUNK_SIZE):
+    """
+    Like :func:`split_multi`, but segment runs of paragraphs of large texts in parallel;
+    See :func:`split_multi_spans_parallel`.
+    """
+    spans = split_multi_spans_parallel(text, join_on_lowercase, short_sentence_length, abbreviations,
+                                       workers, chunk_size)
+    return [text[start:end] for start, end in spans]
+
+
+def split_multi_spans_parallel(text, join_on_lowercase=False, short_sentence_length=SHORT_SENTENCE_LENGTH,
+                               abbreviations=DEFAULT_ABBREVIATIONS, workers=None, chunk_size=PARAGRAPH_CHUNK_SIZE):
+    """
+    Like :func:`split_multi_spans`, but cut the `text` at paragraph separators into runs of paragraphs
+    of at least `chunk_size` chars, and segment those in a pool of `workers` processes.
+
+    The text is only cut between two paragraphs where no sentence can be joined across the separator:
+    Where it is not preceded by an abbreviation or an unclosed bracket, and the next paragraph does not
+    start with a lower-case letter (see :func:`_is_cut`). So the sentences and their offsets into the
+    whole `text` are exactly those of :func:`split_multi_spans`.
+
+    :param workers: the number of worker processes (default: number of CPUs); if 1, no pool is used
+    :param chunk_size: the minimum size of the text segmented per job
+    :returns: a list of the ``(start, end)`` offsets of the sentences
+    """
+    cuts = [0] + list(_paragraph_cuts(text, chunk_size, abbreviations)) + [len(text)]
+    pieces = (text[start:end] for start, end in zip(cuts, cuts[1:]))
+    worker = partial(_split_paragraphs, join_on_lowercase=join_on_lowercase,
+                     short_sentence_length=short_sentence_length, abbreviations=abbreviations)
+    spans = []
+
+    for offset, end, sentences in zip(cuts, cuts[1:], _imap(worker, pieces, workers)):
+        if end < len(text):
+            sentences.pop()  # the empty sentence after the separator at the end of the piece
+
+        spans.extend((start + offset, stop + offset) for start, stop in sentences)
+
+    return spans
 
 
 def split_newline(text):
@@ -230,7 +509,32 @@ def split_newline(text):
             yield line
 
 
-def rewrite_line_separators(text, pattern, join_on_lowercase=False, short_sentence_length=SHORT_SENTENCE_LENGTH):
+def split_stream(chunks, multi=False, join_on_lowercase=False, short_sentence_length=SHORT_SENTENCE_LENGTH,
+                 max_buffer=MAX_STREAM_BUFFER, abbreviations=DEFAULT_ABBREVIATIONS):
+    """
+    Segment a stream of text `chunks` like :func:`split_single` (or, if `multi`, :func:`split_multi`)
+    segments their concatenation, but yield each sentence as soon as no more text can change it.
+
+    Only the last few sentences of the text read so far are kept in a carry-over buffer, as the
+    decision to join them with the following text might still change; If that buffer grows beyond
+    `max_buffer` chars without a certain sentence boundary, it is segmented as if the stream ended there
+    (unless `max_buffer` is None: then the output is always the same as that of the whole text).
+    To segment a file object, read it in blocks: ``split_stream(iter(lambda: fp.read(65536), ''))``.
+    """
+    pattern = MAY_CROSS_ONE_LINE if multi else DO_NOT_CROSS_LINES
+
+    for _, sentence in _stream(chunks, pattern, join_on_lowercase, short_sentence_length, max_buffer, abbreviations):
+        if sentence is None:
+            pass
+        elif multi:
+            yield sentence
+        else:
+            for line in sentence.split('\n'):
+                yield line
+
+
+def rewrite_line_separators(text, pattern, join_on_lowercase=False, short_sentence_length=SHORT_SENTENCE_LENGTH,
+                            abbreviations=DEFAULT_ABBREVIATIONS):
     """
     Remove line separator chars inside sentences and ensure there is a ``\\n`` at their end.
 
@@ -239,13 +543,32 @@ def rewrite_line_separators(text, pattern, join_on_lowercase=False, short_senten
     :param join_on_lowercase: always join sentences that start with lower-case
     :param short_sentence_length: the upper boundary for text spans that are not split
                                   into sentences inside brackets
+    :param abbreviations: the :class:`Abbreviations` index of the abbreviations that do not end sentences
     :return: a generator yielding the spans of text
     """
+    sentences = _sentences(text, pattern, join_on_lowercase, short_sentence_length, abbreviations)
+    return _rewrite(_with_gaps(text, sentences))
+
+
+def rewrite_line_separators_stream(chunks, pattern, join_on_lowercase=False,
+                                   short_sentence_length=SHORT_SENTENCE_LENGTH, max_buffer=MAX_STREAM_BUFFER,
+                                   abbreviations=DEFAULT_ABBREVIATIONS):
+    """
+    A streaming version of :func:`rewrite_line_separators` for text `chunks` (see :func:`split_stream`).
+    """
+    return _rewrite(_stream(chunks, pattern, join_on_lowercase, short_sentence_length, max_buffer, abbreviations))
+
+
+def _rewrite(pairs):
+    """Rewrite the line separators of ``(intervening text, sentence)`` `pairs` (see :func:`_with_gaps`)."""
     offset = 0
 
-    for sentence in _sentences(pattern.split(text), join_on_lowercase, short_sentence_length):
-        start = text.index(sentence, offset)
-        intervening = text[offset:start]
+    for intervening, sentence in pairs:
+        if sentence is None:
+            if intervening:
+                yield intervening
+
+            break
 
         if offset != 0 and '\n' not in intervening:
             yield '\n'
@@ -253,10 +576,264 @@ def rewrite_line_separators(text, pattern, join_on_lowercase=False, short_senten
 
         yield intervening
         yield sentence.replace('\n', ' ')
-        offset = start + len(sentence)
+        offset += len(intervening) + len(sentence)
+
+
+def _with_gaps(text, sentences):
+    """
+    Pair each of the (stripped) `sentences` spans of the `text` with the text in between it and the
+    previous sentence; Finally, pair the rest of the `text` with None.
+    """
+    offset = 0
+
+    for start, end in sentences:
+        if start == end:
+            start = end = offset  # empty sentences directly follow the previous one
+
+        yield text[offset:start], text[start:end]
+        offset = end
+
+    yield text[offset:], None
+
+
+def _stream(chunks, pattern, join_on_lowercase, short_sentence_length, max_buffer, abbreviations):
+    """
+    Segment the `chunks` into the ``(intervening text, sentence)`` pairs of :func:`_with_gaps`,
+    yielding each pair as soon as appending more text cannot change the sentence any more.
+
+    Only the last two units of the :func:`_abbreviation_joiner` can change with more text, because
+    its decisions only depend on the fragments around them; And :func:`_join_units` only yields a
+    sentence once the next unit is not joined onto it, so all sentences but the last that are
+    joined from the other units are certain. The fragments that the `pattern` splits off do not
+    depend on the text before them, so the buffer then can be cut at the start of the last sentence.
+    For the same reason, the separators found in the buffer are kept, and only the end of the text that
+    might still become (part of) a separator is scanned again with the next chunk (see :func:`_scan`),
+    while a separator at the end only grows by the spaces (or newlines) that the next chunk starts with;
+    The chunks are only joined into the buffer once a new separator is certain, so a long run of text
+    without any (or a long separator) takes linear time.
+    """
+    buffer = ''
+    chunks_after = []  # the chunks after the buffer that were not joined into it yet
+    length = 0  # the length of the buffer with the chunks after it
+    gap = ''  # the intervening text before the buffer that was not yielded yet
+    bounds = [0]  # the fragment offsets of the buffer (see :func:`_fragments`) up to its certain separators
+    pos = 0  # the offset of the `tail`, the text that might still become (part of) a separator
+    tail = ''
+    growth = None  # if the text ends with a separator (from `pos` on), the pattern of the chars that extend it
+
+    for chunk in chunks:
+        chunks_after.append(chunk)
+        length += len(chunk)
+        separators = []
+
+        if growth is not None:
+            end = length - len(chunk) + growth.match(chunk).end()
+
+            if end < length:
+                separators.append((pos, end))
+                pos, tail, growth = end, chunk[end - length:], None
+        else:
+            tail += chunk
+
+        if growth is None:
+            found, end, growth = _scan(tail, pattern)
+            separators.extend((pos + start, pos + stop) for start, stop in found)
+            pos, tail = pos + end, tail[end:] if growth is None else ''
+
+        forced = max_buffer is not None and length >= max_buffer
+
+        if not (separators or forced):
+            continue
 
-    if offset < len(text):
-        yield text[offset:]
+        buffer += ''.join(chunks_after)
+        chunks_after = []
+        bounds.extend(offset for span in separators for offset in span)
+
+        if forced:
+            units = _abbreviation_joiner(buffer, _fragments(buffer, pattern), abbreviations)
+            sentences = list(_join_units(buffer, units, join_on_lowercase, short_sentence_length))
+            cut = len(buffer)
+        else:
+            units = list(_abbreviation_joiner(buffer, bounds + [len(buffer)], abbreviations))
+            sentences = list(_join_units(buffer, units[:-2], join_on_lowercase, short_sentence_length))
+
+            if len(sentences) < 2:
+                continue
+
+            cut = sentences.pop()[0]
+
+        offset = 0
+
+        for intervening, sentence in _with_gaps(buffer, [_strip(buffer, start, end) for start, end in sentences]):
+            if sentence is None:
+                break
+
+            yield gap + intervening, sentence
+            gap = ''
+            offset += len(intervening) + len(sentence)
+
+        gap += buffer[offset:cut]
+        buffer = buffer[cut:]
+        length -= cut
+
+        if forced:
+            bounds, pos, tail, growth = [0], 0, '', None
+        else:
+            bounds = [bound - cut for bound in bounds[bisect_left(bounds, cut):]]
+            pos -= cut
+
+    buffer += ''.join(chunks_after)
+
+    if growth is not None:
+        bounds.extend((pos, length))
+    else:
+        bounds.extend(pos + offset for match in pattern.finditer(tail) for offset in match.span())
+
+    units = _abbreviation_joiner(buffer, bounds + [len(buffer)], abbreviations)
+    sentences = _join_units(buffer, units, join_on_lowercase, short_sentence_length)
+
+    for intervening, sentence in _with_gaps(buffer, (_strip(buffer, start, end) for start, end in sentences)):
+        yield gap + intervening, sentence
+        gap = ''
+
+
+def _scan(tail, pattern):
+    """
+    Return the spans of the separators that the `pattern` finds in the `tail` of a text, which are
+    certain whatever text is appended, the offset in the `tail` from where to scan again when more
+    text is appended, and the pattern of the chars that extend a separator at the end of the `tail`.
+
+    That offset is the start of a separator at the end (it might grow: by spaces, or by newlines
+    if it is made of newlines, see :data:`SEPARATOR_GROWTH`), or else of the :data:`OPEN_END`
+    (it might become a separator); In the latter case, the returned pattern is None.
+    """
+    separators = []
+
+    for match in pattern.finditer(tail):
+        if match.end() == len(tail):
+            return separators, match.start(), SEPARATOR_GROWTH[tail[match.start()] == '\n']
+
+        separators.append(match.span())
+
+    return separators, OPEN_END.search(tail, separators[-1][1] if separators else 0).start(), None
+
+
+def _paragraph_cuts(text, chunk_size, abbreviations):
+    """Yield the offsets where :func:`split_multi_spans_parallel` cuts the `text`, at least `chunk_size` apart."""
+    last = 0
+    pos = chunk_size
+
+    while pos < len(text):
+        match = PARAGRAPH_SEPARATOR.search(text, pos)
+
+        if match is None:
+            break
+
+        start, cut = match.span()
+
+        if _is_cut(text, last, start, cut, abbreviations):
+            yield cut
+            last = cut
+            pos = cut + chunk_size
+        else:
+            pos = cut + 1
+
+
+def _is_cut(text, last, start, cut, abbreviations):
+    """
+    Check if the paragraph separator from `start` to `cut` always splits sentences, so that the text
+    from the `last` cut to the separator and the text after it segment like the whole text does.
+
+    Conservatively, that is if the separator is made of newline chars only; if the next paragraph does not
+    start with a lower-case letter (or a continuation); if no span before the separator (since the `last`
+    cut) ends with an open bracket; And if the paragraph does not end with a dot after whitespace, a digit,
+    an upper-case letter, a single char, or any of the `abbreviations`.
+    """
+    if cut >= len(text) or start <= last or text[cut].isspace() or text[cut].islower() or text[start - 1].isspace():
+        return False
+
+    terminal = TERMINAL_END.match(text, last, start)
+
+    if terminal is not None and text[terminal.start()] == '.':
+        dot = terminal.start()
+
+        if dot - 2 < last or text[dot - 2].isspace() or text[dot - 1].isspace():
+            return False
+
+        if text[dot - 1].isdigit() or text[dot - 1].isupper():
+            return False
+
+        # the window is longer than any abbreviation, and at worst too short for a single digit or char fragment
+        if abbreviations.ends_with_abbreviation(text[max(last, dot - 256):dot]):
+            return False
+
+    return not (_may_end_open(text, last, start, '()') or _may_end_open(text, last, start, '[]'))
+
+
+def _may_end_open(text, start, end, brackets):
+    """Check if any span of the text from `start` (or later) to `end` ends with an unclosed bracket."""
+    opener = text.rfind(brackets[0], start, end)
+    closer = text.rfind(brackets[1], start, end)
+    balance = 0
+
+    while opener != -1:
+        if closer > opener:
+            balance -= 1
+            closer = text.rfind(brackets[1], start, closer)
+        else:
+            balance += 1
+
+            if balance > 0:
+                return True
+
+            opener = text.rfind(brackets[0], start, opener)
+
+    return False
+
+
+def _split_paragraphs(text, join_on_lowercase, short_sentence_length, abbreviations):
+    """Return the :func:`split_multi_spans` of a run of paragraphs (the :func:`split_multi_spans_parallel` job)."""
+    return list(split_multi_spans(text, join_on_lowercase, short_sentence_length, abbreviations))
+
+
+def _imap(function, items, workers):
+    """Map the `function` over the `items` in a pool of `workers` processes (if 1, in this process), in order."""
+    if workers == 1:
+        for item in items:
+            yield function(item)
+
+        return
+
+    from multiprocessing import Pool  # only pay for importing it when actually used
+
+    pool = Pool(workers)
+
+    try:
+        for result in pool.imap(function, items, 1):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _lines(text, start, end):
+    """Yield the spans of ``text[start:end].split('\\n')``."""
+    newline = text.find('\n', start, end)
+
+    while newline != -1:
+        yield start, newline
+        start = newline + 1
+        newline = text.find('\n', start, end)
+
+    yield start, end
+
+
+def _strip(text, start, end):
+    """Return the span from `start` to `end` without leading and trailing whitespace."""
+    span = text[start:end]
+    stripped = span.lstrip()
+    start += len(span) - len(stripped)
+    return start, start + len(stripped.rstrip())
 
 
 def to_unix_linebreaks(text):
@@ -264,82 +841,110 @@ def to_unix_linebreaks(text):
     return NON_UNIX_LINEBREAK.sub('\n', text)
 
 
-def _sentences(spans, join_on_lowercase, short_sentence_length):
-    """Join spans back together into sentences as necessary."""
+def _sentences(text, pattern, join_on_lowercase, short_sentence_length, abbreviations):
+    """Split the `text` with the `pattern` and yield the (stripped) spans of the sentences."""
+    units = _abbreviation_joiner(text, _fragments(text, pattern), abbreviations)
+
+    for start, end in _join_units(text, units, join_on_lowercase, short_sentence_length):
+        yield _strip(text, start, end)
+
+
+def _fragments(text, pattern):
+    """
+    Return the offsets that separate the pieces of ``pattern.split(text)``: from 0, the offsets
+    of the text fragments (at even indices) alternate with those of the separators in between.
+    """
+    bounds = [0]
+
+    for match in pattern.finditer(text):
+        bounds.extend(match.span())
+
+    bounds.append(len(text))
+    return bounds
+
+
+def _join_units(text, units, join_on_lowercase, short_sentence_length):
+    """Join the (contiguous) unit spans of the :func:`_abbreviation_joiner` into sentence spans as necessary."""
     last = None
 
     def shorterThanATypicalSentence(c, l):
         return c < short_sentence_length or l < short_sentence_length
 
-    for current in _abbreviation_joiner(spans):
+    for start, end in units:
         if last is not None:
-            if (join_on_lowercase or BEFORE_LOWER.match(last)) and LOWER_WORD.match(current):
-                last = '%s%s' % (last, current)
-            elif shorterThanATypicalSentence(len(current), len(last)) and _is_open(last) and (
-                _is_not_opened(current) or last.endswith(' et al. ') or
-                (UPPER_CASE_END.search(last) and UPPER_CASE_START.match(current))
+            first, stop = last
+            current = text[start:end]
+
+            if (join_on_lowercase or BEFORE_LOWER_SUFFIX.match(text, first, stop)) and LOWER_WORD.match(current):
+                last = first, end
+            elif shorterThanATypicalSentence(end - start, stop - first) and _is_open(text, '()', first, stop) and (
+                _is_not_opened(current) or text.endswith(' et al. ', first, stop) or
+                (UPPER_CASE_END_SUFFIX.match(text, first, stop) and UPPER_CASE_START.match(current))
             ):
-                last = '%s%s' % (last, current)
-            elif shorterThanATypicalSentence(len(current), len(last)) and _is_open(last, '[]') and (
-                _is_not_opened(current, '[]') or last.endswith(' et al. ') or
-                (UPPER_CASE_END.search(last) and UPPER_CASE_START.match(current))
+                last = first, end
+            elif shorterThanATypicalSentence(end - start, stop - first) and _is_open(text, '[]', first, stop) and (
+                _is_not_opened(current, '[]') or text.endswith(' et al. ', first, stop) or
+                (UPPER_CASE_END_SUFFIX.match(text, first, stop) and UPPER_CASE_START.match(current))
             ):
-                last = '%s%s' % (last, current)
+                last = first, end
             elif CONTINUATIONS.match(current):
-                last = '%s%s' % (last, current)
+                last = first, end
             else:
-                yield last.strip()
-                last = current
+                yield last
+                last = start, end
         else:
-            last = current
+            last = start, end
 
     if last is not None:
-        yield last.strip()
+        yield last
 
 
-def _abbreviation_joiner(spans):
-    """Join spans that match the ABBREVIATIONS pattern."""
+def _abbreviation_joiner(text, bounds, abbreviations):
+    """Join the fragments (see :func:`_fragments`) that end with `abbreviations` into unit spans."""
     segment = None
-
-    def makeSentence(start, end):
-        return ''.join(spans[start:end])
-
-    total = len(spans)
+    total = len(bounds) - 1
 
     for pos in range(total):
-        if pos and pos % 2:  # even => segment, uneven => (potential) terminal
-            prev_s = spans[pos - 1]
-            marker = spans[pos]
-            next_s = spans[pos + 1] if pos + 1 < total else None
+        if pos % 2:  # even => segment, uneven => (potential) terminal
+            prev_s = text[bounds[pos - 1]:bounds[pos]]
 
             if prev_s[-1:].isspace():
                 pass  # join
-            elif marker[0] == '.' and ABBREVIATIONS.search(prev_s):
-                pass  # join
-            elif marker[0] == '.' and next_s and (
-                LONE_WORD.match(next_s) or (ENDS_IN_DATE_DIGITS.search(prev_s) and MONTH.match(next_s)) or
-                (MIDDLE_INITIAL_END.search(prev_s)
-                 and UPPER_WORD_START.match(next_s))
-            ):
+            elif text[bounds[pos]] != '.':
+                yield bounds[segment], bounds[pos + 1]
+                segment = None
+            elif abbreviations.ends_with_abbreviation(prev_s):
                 pass  # join
             else:
-                yield makeSentence(segment, pos + 1)
-                segment = None
+                next_s = text[bounds[pos + 1]:bounds[pos + 2]] if pos + 1 < total else None
+
+                if next_s and (
+                    LONE_WORD.match(next_s) or (ENDS_IN_DATE_DIGITS_SUFFIX.match(prev_s) and MONTH.match(next_s)) or
+                    (MIDDLE_INITIAL_END_SUFFIX.match(prev_s)
+                     and UPPER_WORD_START.match(next_s))
+                ):
+                    pass  # join
+                else:
+                    yield bounds[segment], bounds[pos + 1]
+                    segment = None
         elif segment is None:
             segment = pos
 
     if segment is not None:
-        yield makeSentence(segment, total)
+        yield bounds[segment], bounds[total]
+
 
+def _is_open(span_str, brackets='()', start=0, end=None):
+    """Check if the span (from `start` to `end`) ends with an unclosed `bracket`."""
+    if end is None:
+        end = len(span_str)
 
-def _is_open(span_str, brackets='()'):
-    """Check if the span ends with an unclosed `bracket`."""
-    offset = span_str.find(brackets[0])
+    offset = span_str.find(brackets[0], start, end)
     nesting = 0 if offset == -1 else 1
 
     while offset != -1:
-        opener = span_str.find(brackets[0], offset + 1)
-        closer = span_str.find(brackets[1], offset + 1)
+        opener = span_str.find(brackets[0], offset + 1, end)
+        closer = span_str.find(brackets[1], offset + 1, end)
 
         if opener == -1:
             if closer == -1:
@@ -417,7 +1022,7 @@ def main():
         help='STDIN (only!) input is ID-tab-TEXT; the ID is '
         'preserved in the output as ID-tab-N-tab-SENTENCE '
         'where N is the incremental sentence number for that '
-        'text ID'
+        'text ID; each line is segmented on its own, in any mode'
     )
     parser.add_argument('--normal-breaks', '-n',
                         action='store_true', help=to_unix_linebreaks.__doc__)
@@ -432,6 +1037,22 @@ def main():
     )
     parser.add_argument('--encoding', '-e',
                         help='force another encoding to use')
+    parser.add_argument(
+        '--abbreviations',
+        '-a',
+        metavar='FILE',
+        action='append',
+        help='add the abbreviations in FILE (UTF-8, one per line) to the built-in ones; may be repeated'
+    )
+    parser.add_argument(
+        '--jobs',
+        '-j',
+        metavar='N',
+        type=int,
+        default=1,
+        help='number of worker processes that segment the FILEs or blocks of STDIN lines; '
+        'the output stays in input order [%(default)d]'
+    )
     mode = parser.add_mutually_exclusive_group()
     parser.set_defaults(mode=single)
     mode.add_argument('--single', '-s', action='store_const',
@@ -440,11 +1061,6 @@ def main():
                       dest='mode', const=multi, help=split_multi.__doc__)
 
     args = parser.parse_args()
-    pattern = [
-        DO_NOT_CROSS_LINES,
-        MAY_CROSS_ONE_LINE,
-    ][args.mode]
-    normal = to_unix_linebreaks if args.normal_breaks else lambda t: t
 
     # fix broken Unicode handling in Python 2.x
     # see http://www.macfreek.nl/memory/Encoding_of_Python_stdout
@@ -463,55 +1079,141 @@ def main():
             stderr.write('wrapped segmenter stdio with UTF-8 de/encoders')
             stderr.write(linesep)
 
-    if not args.files and args.mode != single:
+    if args.jobs < 1:
+        parser.error('the number of jobs must be positive')
+
+    if not args.files and not args.with_ids and args.mode != single:
         parser.error(
-            'only single line splitting mode allowed ' 'when reading from STDIN')
+            'only single line splitting mode allowed ' 'when reading from STDIN without IDs')
 
-    def segment(text):
-        if not args.files and args.with_ids:
-            tid, text = text.split('\t', 1)
-        else:
-            tid = None
+    abbreviations = Abbreviations.load(args.abbreviations) if args.abbreviations else DEFAULT_ABBREVIATIONS
+    options = dict(multi=args.mode == multi, normal_breaks=args.normal_breaks,
+                   short_sentence_length=args.bracket_spans, abbreviations=abbreviations)
 
-        if args.mode == single:
-            sentences = split_single(
-                normal(text), short_sentence_length=args.bracket_spans)
-            text_spans = [i for s in sentences for i in (s, '\n')]
-        else:
-            text_spans = rewrite_line_separators(
-                normal(text), pattern, short_sentence_length=args.bracket_spans)
+    def write(text_spans):
+        for span in text_spans:
+            stdout.write(span)
 
-        if tid is not None:
+    def read_blocks():
+        block, length = [], 0
 
-            def write_ids(tid, sid):
-                stdout.write(tid)
-                stdout.write('\t')
-                stdout.write(str(sid))
-                stdout.write('\t')
-
-            last = '\n'
-            sid = 1
+        for line in stdin:
+            block.append(line)
+            length += len(line)
 
-            for span in text_spans:
-                if last == '\n' and span not in ('', '\n'):
-                    write_ids(tid, sid)
-                    sid += 1
+            if length >= JOB_BLOCK_SIZE:
+                yield block
+                block, length = [], 0
 
-                stdout.write(span)
+        if block:
+            yield block
 
-                if span:
-                    last = span
+    if args.jobs > 1:
+        if args.files:
+            worker = partial(_segment_path, encoding=args.encoding or 'utf-8', **options)
+            inputs = args.files
         else:
-            for span in text_spans:
-                stdout.write(span)
+            worker = partial(_segment_records, with_ids=args.with_ids, **options)
+            inputs = read_blocks()
 
-    if args.files:
+        # the results come in the order of the inputs; each is written at once
+        for output in _imap(worker, inputs, args.jobs):
+            stdout.write(output)
+    elif args.files:
         for txt_file_path in args.files:
             with codecs.open(txt_file_path, 'r', encoding=(args.encoding or 'utf-8')) as fp:
-                segment(fp.read())
+                write(_segment_chunks(_read_chunks(fp, args.normal_breaks), options['multi'],
+                                      args.bracket_spans, abbreviations))
     else:
         for line in stdin:
-            segment(line)
+            write(_segment_record(line, with_ids=args.with_ids, **options))
+
+
+def _segment_record(text, multi, normal_breaks, short_sentence_length, abbreviations, with_ids=False):
+    """
+    Segment one input record (line) of :func:`main` into the pieces of its output text, one sentence
+    per line; If `with_ids`, the record is ID-tab-TEXT and each sentence is prefixed with ID-tab-N-tab.
+    """
+    tid = None
+
+    if with_ids:
+        tid, text = text.split('\t', 1)
+
+    if normal_breaks:
+        text = to_unix_linebreaks(text)
+
+    if multi:
+        sentences = (s.replace('\n', ' ') for s in split_multi(
+            text, short_sentence_length=short_sentence_length, abbreviations=abbreviations))
+    else:
+        sentences = split_single(text, short_sentence_length=short_sentence_length, abbreviations=abbreviations)
+
+    text_spans = (i for s in sentences for i in (s, '\n'))
+    return text_spans if tid is None else _numbered(text_spans, tid)
+
+
+def _segment_records(records, multi, normal_breaks, short_sentence_length, abbreviations, with_ids=False):
+    """Segment a block of input `records` into their joined output text (see :func:`_segment_record`)."""
+    return ''.join(span for text in records for span in _segment_record(
+        text, multi, normal_breaks, short_sentence_length, abbreviations, with_ids))
+
+
+def _segment_chunks(chunks, multi, short_sentence_length, abbreviations):
+    """
+    Segment a stream of text `chunks` (a file) into the pieces of the output text of :func:`main`;
+    The stream buffer is unbounded, so that the output is exactly that of segmenting the whole file.
+    """
+    if multi:
+        return rewrite_line_separators_stream(chunks, MAY_CROSS_ONE_LINE, short_sentence_length=short_sentence_length,
+                                              max_buffer=None, abbreviations=abbreviations)
+
+    sentences = split_stream(chunks, short_sentence_length=short_sentence_length, max_buffer=None,
+                             abbreviations=abbreviations)
+    return (i for s in sentences for i in (s, '\n'))
+
+
+def _segment_path(path, encoding, multi, normal_breaks, short_sentence_length, abbreviations):
+    """Segment the file at `path` into its output text (see :func:`_segment_chunks`)."""
+    with codecs.open(path, 'r', encoding=encoding) as fp:
+        return ''.join(_segment_chunks(_read_chunks(fp, normal_breaks), multi, short_sentence_length, abbreviations))
+
+
+def _read_chunks(fp, normal_breaks=False):
+    """Read the file object `fp` in chunks, converting them to Unix linebreaks if `normal_breaks`."""
+    pending = ''
+
+    for chunk in iter(lambda: fp.read(1 << 16), ''):
+        chunk = pending + chunk
+
+        # hold back a final carriage return, as it could be part of a Windows linebreak
+        if normal_breaks and chunk.endswith('\r'):
+            chunk, pending = chunk[:-1], '\r'
+        else:
+            pending = ''
+
+        yield to_unix_linebreaks(chunk) if normal_breaks else chunk
+
+    if pending:
+        yield to_unix_linebreaks(pending)
+
+
+def _numbered(text_spans, tid):
+    """Prefix each sentence in the `text_spans` with the text ID `tid` and its sentence number."""
+    last = '\n'
+    sid = 1
+
+    for span in text_spans:
+        if last == '\n' and span not in ('', '\n'):
+            yield tid
+            yield '\t'
+            yield str(sid)
+            yield '\t'
+            sid += 1
+
+        yield span
+
+        if span:
+            last = span
 
 
 if __name__ == '__main__':
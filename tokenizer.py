@@ -10,8 +10,20 @@ If a text were to contains such characters, normalize it first.
 from __future__ import absolute_import, unicode_literals
 
 import codecs
-
-from regex import UNICODE, VERBOSE, compile
+import mmap
+import os
+import pickle
+import re
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from functools import partial
+
+from regex import ASCII, UNICODE, VERBOSE, __version__ as regex_version
 
 try:
     from html import unescape
@@ -26,11 +38,20 @@ except ImportError:
 
 
 try:
-    from .Segmenter import SENTENCE_TERMINALS, HYPHENS
+    unichr
+except NameError:
+    # Python 3
+    unichr = chr
+
+try:
+    from .patterns import compile
+    from .segmenter import SENTENCE_TERMINALS, HYPHENS
 except ImportError:
     # if used as command-line tool
     # noinspection PyUnresolvedReferences
-    from .Segmenter import SENTENCE_TERMINALS, HYPHENS
+    from patterns import compile
+    # noinspection PyUnresolvedReferences
+    from segmenter import SENTENCE_TERMINALS, HYPHENS
 
 __author__ = 'Florian Leitner <florian.leitner@gmail.com>'
 
@@ -78,6 +99,104 @@ and terminates with a alphanumeric character on this next line.
 The opening char and hyphen as well as the terminating char are captured in two groups.
 """
 
+WORD_REGEX = r"""((?:
+    # Dots, except ellipsis
+    {alnum} \. (?!\.\.)
+    | # Comma, surrounded by digits (e.g., chemicals) or letters
+    {alnum} , (?={alnum})
+    | # Colon, surrounded by digits (e.g., time, references)
+    {number} : (?={number})
+    | # Hyphen, surrounded by digits (e.g., DNA endings: "5'-ACGT-3'") or letters
+    {alnum} {apo}? {hyphen} (?={alnum})  # incl. optional apostrophe for DNA segments
+    | # Apostophes, non-consecutive
+    {apo} (?!{apo})
+    | # ASCII single quote, surrounded by digits or letters (no dangling allowed)
+    {alnum} ' (?={alnum})
+    | # ASCII single quote after an s and at the token's end
+    s ' {end}
+    | # Terminal dimensions (superscript minus, 1, 2, and 3) attached to physical units
+    #  size-prefix                 unit-acronym    dimension
+    \b [yzafpn\u00B5mcdhkMGTPEZY]? {letter}{{1,3}} {power} {end}
+    | # Atom counts (subscript numbers) and ionization states (optional superscript
+    #   2 or 3 followed by a + or -) are attached to valid fragments of a chemical formula
+    \b (?:[A-Z][a-z]?|[\)\]])+ {subdigit}+ (?:[\u00B2\u00B3]?[\u207A\u207B])?
+    | # Any (Unicode) letter, digit, or the underscore
+    {alnum}
+    )+)"""
+"""
+The token pattern of the :func:`word_tokenizer`, with the character classes to format in.
+The `end` (of a token) is formatted in, too, to allow matching tokens without splitting on spaces first.
+"""
+
+ASCII_ALNUM = r'[A-Za-z0-9]'
+"""The ASCII subset of :data:`ALNUM`."""
+
+ASCII_WORDS = compile(
+    r'(\s+)|' + WORD_REGEX.format(
+        alnum=ASCII_ALNUM, apo=APOSTROPHE, power=POWER, subdigit=SUBDIGIT, hyphen='-', letter='[A-Za-z]',
+        number='[0-9]', end=r'(?!\S)'
+    ), ASCII | VERBOSE
+)
+"""
+The :func:`word_tokenizer` pattern for pure ASCII text, fused with the space separator:
+Spaces are captured in the first group and tokens in the second, while the separators of
+the :func:`word_tokenizer` are the uncaptured spans in between.
+"""
+
+ASCII_SYMBOLS = compile(r'[A-Za-z0-9]+|[^\sA-Za-z0-9]+', ASCII)
+"""The :func:`symbol_tokenizer` tokens in pure ASCII text."""
+
+ASCII_HYPHENATED_LINEBREAK = compile(
+    r'({alnum}-)[ \t]*?(?:\r\n|\n|\r)[ \t]*?({alnum})'.format(alnum=ASCII_ALNUM), ASCII
+)
+"""The :data:`HYPHENATED_LINEBREAK` pattern for pure ASCII text."""
+
+ASCII_SEPARATORS = compile(r'[\x1C-\x1F]', ASCII)
+"""The only ASCII characters that :meth:`str.split` but not the ``\\s`` class considers spaces."""
+
+CHARACTER_CLASSES_CACHE = os.path.join(
+    os.path.expanduser('~'), '.cache', 'text_processing', 'character_classes-%s.pickle' % regex_version
+)
+"""
+The disk cache of the :func:`character_classes` table.
+Its name contains the version of the regex module, because the table is built from its Unicode data.
+"""
+
+CLASSIFIED_SYMBOLS = re.compile(r'[LN]+|[^LN ]+')
+"""
+The :func:`symbol_tokenizer` tokens in a text classified by :func:`character_classes`.
+No Unicode properties are needed here, so the (for this, faster) standard library engine is used.
+"""
+
+CHARREF = compile(r'&(#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?)')
+"""The (HTML5) character reference pattern that :func:`unescape` replaces."""
+
+PROTECTED_TIMEOUT = 0.1
+"""The default regex timeout in seconds of the protected mode (see :func:`word_tokenizer`)."""
+
+FALLBACKS = Counter()
+"""
+How often the protected mode fell back to a simpler tokenization, by the stage that timed out:
+``'linebreaks'`` (hyphenated linebreaks were not joined), ``'words'`` (a span was tokenized like
+the :func:`symbol_tokenizer`), ``'terminal'`` (the last words were not matched as word tokens),
+and ``'web'`` (URIs and e-mail addresses were not protected).
+The counts are per process; Workers of :func:`tokenize_many` count in their own copy.
+"""
+
+INDEX_SUFFIX = '.tokens.idx'
+"""The suffix of the token index file that :func:`index_file` writes next to the text file."""
+
+INDEX_MAGIC = b'TOKIDX\x00\x01'
+"""The first bytes of a (version 1) token index file."""
+
+INDEX_HEADER = struct.Struct('<8s8s4Q')
+"""
+The header of a token index file: the magic bytes, the (NUL-padded) tokenizer name, the item size of
+the offsets (4 or 8 bytes), the size of the indexed text file, and the number of lines and of tokens.
+The header is followed by the little-endian ``(start, end)`` byte offsets of all tokens in the
+text file and then by the offsets of each line's first token in that list (plus the total).
+"""
+
 IS_POSSESSIVE = compile(
     r"{alnum}+(?:{hyphen}{alnum}+)*(?:{apo}[sS]|[sS]{apo})$".format(
         alnum=ALNUM, hyphen=HYPHEN, apo="['" + APOSTROPHE[1:]
@@ -107,22 +226,29 @@ def split_possessive_markers(tokens):
     :param tokens: a list of tokens
     :returns: an updated list if a split was made or the original list otherwise
     """
-    idx = -1
+    tokens[:] = list(iter_split_possessive_markers(tokens))
+    return tokens
+
 
-    for token in list(tokens):
-        idx += 1
+def iter_split_possessive_markers(tokens):
+    """
+    A generator version of :func:`split_possessive_markers` that lazily splits any iterable of tokens.
 
+    :param tokens: an iterable of tokens
+    :returns: a generator of the (split) tokens
+    """
+    for token in tokens:
         if IS_POSSESSIVE.match(token) is not None:
             if token[-1].lower() == 's' and token[-2] in APOSTROPHES:
-                tokens.insert(idx, token[:-2])
-                idx += 1
-                tokens[idx] = token[-2:]
+                yield token[:-2]
+                yield token[-2:]
+                continue
             elif token[-2].lower() == 's' and token[-1] in APOSTROPHES:
-                tokens.insert(idx, token[:-1])
-                idx += 1
-                tokens[idx] = token[-1:]
+                yield token[:-1]
+                yield token[-1:]
+                continue
 
-    return tokens
+        yield token
 
 
 def split_contractions(tokens):
@@ -134,25 +260,126 @@ def split_contractions(tokens):
     :param tokens: a list of tokens
     :returns: an updated list if a split was made or the original list otherwise
     """
-    idx = -1
+    tokens[:] = list(iter_split_contractions(tokens))
+    return tokens
 
-    for token in list(tokens):
-        idx += 1
 
-        if IS_CONTRACTION.match(token) is not None:
-            length = len(token)
+def iter_split_contractions(tokens):
+    """
+    A generator version of :func:`split_contractions` that lazily splits any iterable of tokens.
 
-            if length > 1:
-                for pos in range(length - 1, -1, -1):
-                    if token[pos] in APOSTROPHES:
-                        if 2 < length and pos + 2 == length and token[-1] == 't' and token[pos - 1] == 'n':
-                            pos -= 1
+    :param tokens: an iterable of tokens
+    :returns: a generator of the (split) tokens
+    """
+    for token in tokens:
+        pos = _contraction(token)
 
-                        tokens.insert(idx, token[:pos])
-                        idx += 1
-                        tokens[idx] = token[pos:]
+        if pos is not None:  # a bare "n't" is split into an empty token and itself
+            yield token[:pos]
+            yield token[pos:]
+        else:
+            yield token
 
-    return tokens
+
+def iter_split_contraction_spans(tokens):
+    """
+    A span mode of :func:`iter_split_contractions` for ``(token, start, end)`` triples, like those of
+    :func:`word_tokenizer_with_spans`: the offsets of a split token are split, too.
+
+    :param tokens: an iterable of ``(token, start, end)`` triples
+    :returns: a generator of the (split) triples
+    """
+    for token, start, end in tokens:
+        pos = _contraction(token)
+
+        if pos is not None:  # a bare "n't" is split into an empty token and itself
+            # the contraction suffix never spans a joined linebreak, so it has the same length in the text
+            split = end - len(token) + pos
+            yield token[:pos], start, split
+            yield token[pos:], split, end
+        else:
+            yield token, start, end
+
+
+def _contraction(token):
+    """Return the offset in the `token` where its contraction should be split off, if any (else None)."""
+    length = len(token)
+
+    if length > 1 and IS_CONTRACTION.match(token) is not None:
+        # a contraction has exactly one apostrophe; split before it, or before "n't"
+        pos = max(token.rfind(apo) for apo in APOSTROPHES)
+
+        if 2 < length and pos + 2 == length and token[-1] == 't' and token[pos - 1] == 'n':
+            pos -= 1
+
+        return pos
+
+    return None
+
+
+_character_classes = None
+
+
+def character_classes():
+    """
+    Return the :meth:`str.translate` table that classifies each Unicode character in one lookup.
+
+    Letters (see :data:`LETTER`) are mapped to ``L``, numbers (see :data:`NUMBER`) to ``N``,
+    and spaces (``\\s``) to a space; Any other character is not in the table and so remains itself.
+    The table is built from the Unicode data of the regex module the first time it is needed,
+    so that it always agrees with the regular expressions, and then cached on disk,
+    in :data:`CHARACTER_CLASSES_CACHE`.
+    """
+    global _character_classes
+
+    if _character_classes is None:
+        try:
+            with open(CHARACTER_CLASSES_CACHE, 'rb') as fp:
+                _character_classes = pickle.load(fp)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            _character_classes = _build_character_classes()
+            _save_character_classes(_character_classes)
+
+    return _character_classes
+
+
+def _build_character_classes():
+    """Build the :func:`character_classes` table by matching the character classes on all code points."""
+    from sys import maxunicode
+
+    everything = ''.join(unichr(codepoint) for codepoint in range(maxunicode + 1))
+    table = {}
+
+    for regex, cls in ((LETTER, 'L'), (NUMBER, 'N'), (r'\s', ' ')):
+        for match in compile(regex + '+', UNICODE).finditer(everything):
+            for codepoint in range(match.start(), match.end()):
+                table[codepoint] = cls
+
+    return table
+
+
+def _save_character_classes(table):
+    """Try to cache the `table` on disk; The cache is optional, so any failure is ignored."""
+    temporary = '%s.%d' % (CHARACTER_CLASSES_CACHE, os.getpid())
+
+    try:
+        if not os.path.isdir(os.path.dirname(CHARACTER_CLASSES_CACHE)):
+            os.makedirs(os.path.dirname(CHARACTER_CLASSES_CACHE))
+
+        with open(temporary, 'wb') as fp:
+            pickle.dump(table, fp, 2)
+
+        os.rename(temporary, CHARACTER_CLASSES_CACHE)
+    except (IOError, OSError):
+        pass
+
+
+def _is_ascii(text):
+    """Check if the `text` is pure ASCII (always false before Python 3.7)."""
+    try:
+        return text.isascii()
+    except AttributeError:
+        return False
 
 
 def _matches(regex):
@@ -160,13 +387,136 @@ def _matches(regex):
 
     def match_decorator(fn):
         automaton = compile(regex, UNICODE | VERBOSE)
-        fn.split = automaton.split
-        fn.match = automaton.match
+        fn.automaton = automaton
+        # defer to the automaton at call time, so it only gets compiled on first use
+        fn.split = lambda *args, **kwargs: automaton.split(*args, **kwargs)
+        fn.match = lambda *args, **kwargs: automaton.match(*args, **kwargs)
         return fn
 
     return match_decorator
 
 
+def _split_spans(automaton, text, start=0, end=None, timeout=None):
+    """
+    Offset-based equivalent of ``[t for t in automaton.split(text[start:end]) if t]``.
+
+    Separators are only returned if the `automaton` captures them in its last group.
+
+    :param automaton: a (lazy) compiled pattern
+    :param text: the text to split
+    :param start: the offset in `text` to start at
+    :param end: the offset in `text` to end at (default: its length)
+    :param timeout: the maximum time in seconds of the whole scan (raises :class:`TimeoutError`)
+    :returns: a generator of ``(start, end)`` offsets into `text`
+    """
+    if end is None:
+        end = len(text)
+
+    for match in automaton.finditer(text, start, end, timeout=timeout):
+        if start < match.start():
+            yield start, match.start()
+
+        if match.lastindex == automaton.groups:
+            yield match.span()
+
+        start = match.end()
+
+    if start < end:
+        yield start, end
+
+
+def _prune(sentence, timeout=None):
+    """
+    Join all :data:`HYPHENATED_LINEBREAK` matches in the `sentence` (i.e., remove the linebreaks).
+
+    If the scan takes longer than the `timeout`, the `sentence` is returned as it is.
+
+    :returns: the pruned text, the offsets in the pruned text where text was removed,
+              and the cumulative lengths of the removed text before each of those offsets
+    """
+    points, shifts = [], [0]
+    pieces = []
+    last = 0
+    automaton = ASCII_HYPHENATED_LINEBREAK if _is_ascii(sentence) else HYPHENATED_LINEBREAK
+
+    try:
+        matches = list(automaton.finditer(sentence, timeout=timeout))
+    except TimeoutError:
+        FALLBACKS['linebreaks'] += 1
+        return sentence, points, shifts
+
+    for match in matches:
+        pieces.append(sentence[last:match.end(1)])
+        points.append(match.end(1) - shifts[-1])
+        shifts.append(shifts[-1] + match.start(2) - match.end(1))
+        last = match.start(2)
+
+    if not points:
+        return sentence, points, shifts
+
+    pieces.append(sentence[last:])
+    return ''.join(pieces), points, shifts
+
+
+def _unprune(spans, points, shifts):
+    """Map `spans` over a text pruned by :func:`_prune` back to offsets into the original text."""
+    if not points:
+        return spans
+
+    return [(start + shifts[bisect_right(points, start)], end + shifts[bisect_left(points, end)])
+            for start, end in spans]
+
+
+def _unescape_offsets(text):
+    """
+    Un-escape the `text` like :func:`unescape`, but also map offsets back to the `text`.
+
+    A span that covers only a part of the replacement of a character reference is widened to cover
+    the entire reference.
+
+    :returns: the un-escaped text and a function mapping a ``(start, end)`` span over it back to
+              offsets into the `text`
+    """
+    pieces = []
+    starts, ends, refs = [], [], []  # un-escaped offsets and the (start, end) of each reference
+    last = length = 0
+
+    for match in CHARREF.finditer(text):
+        ref = match.group(0)
+        replacement = unescape(ref)
+
+        if replacement != ref:
+            pieces.append(text[last:match.start()])
+            length += match.start() - last
+            starts.append(length)
+            length += len(replacement)
+            ends.append(length)
+            refs.append(match.span())
+            pieces.append(replacement)
+            last = match.end()
+
+    if not refs:
+        return text, lambda span: span
+
+    pieces.append(text[last:])
+
+    def to_original(span):
+        start, end = span
+        idx = bisect_right(starts, start) - 1
+
+        if idx != -1:
+            start = refs[idx][0] if start < ends[idx] else start - ends[idx] + refs[idx][1]
+
+        idx = bisect_left(starts, end) - 1
+
+        if idx != -1:
+            end = refs[idx][1] if end <= ends[idx] else end - ends[idx] + refs[idx][1]
+
+        return start, end
+
+    return ''.join(pieces), to_original
+
+
 @_matches(r'\s+')
 def space_tokenizer(sentence):
     """
@@ -175,7 +525,15 @@ def space_tokenizer(sentence):
     Split on Unicode spaces ``\\s+`` (i.e., any kind of **Unicode** space character).
     The separating space characters are not included in the resulting token list.
     """
-    return [token for token in space_tokenizer.split(sentence) if token]
+    if _is_ascii(sentence) and ASCII_SEPARATORS.search(sentence) is None:
+        return sentence.split()
+
+    return [token for token in space_tokenizer.automaton.split(sentence) if token]
+
+
+def space_tokenizer_spans(sentence):
+    """Span mode of the :func:`space_tokenizer`: return the ``(start, end)`` offsets of its tokens."""
+    return list(_split_spans(space_tokenizer.automaton, sentence))
 
 
 @_matches(r'(%s+)' % ALNUM)
@@ -185,37 +543,29 @@ def symbol_tokenizer(sentence):
 
     Separates alphanumeric Unicode character sequences in already space-split tokens.
     """
-    return [token for span in space_tokenizer(sentence) for token in symbol_tokenizer.split(span) if token]
+    if _is_ascii(sentence):
+        return ASCII_SYMBOLS.findall(sentence)
+
+    # a single pass over the classified characters finds the alphanumeric and other symbol runs
+    classes = sentence.translate(character_classes())
+    return [sentence[match.start():match.end()] for match in CLASSIFIED_SYMBOLS.finditer(classes)]
+
+
+def symbol_tokenizer_spans(sentence):
+    """Span mode of the :func:`symbol_tokenizer`: return the ``(start, end)`` offsets of its tokens."""
+    if _is_ascii(sentence):
+        return [match.span() for match in ASCII_SYMBOLS.finditer(sentence)]
+
+    return [match.span() for match in CLASSIFIED_SYMBOLS.finditer(sentence.translate(character_classes()))]
 
 
 @_matches(
-    r"""((?:
-    # Dots, except ellipsis
-    {alnum} \. (?!\.\.)
-    | # Comma, surrounded by digits (e.g., chemicals) or letters
-    {alnum} , (?={alnum})
-    | # Colon, surrounded by digits (e.g., time, references)
-    {number} : (?={number})
-    | # Hyphen, surrounded by digits (e.g., DNA endings: "5'-ACGT-3'") or letters
-    {alnum} {apo}? {hyphen} (?={alnum})  # incl. optional apostrophe for DNA segments
-    | # Apostophes, non-consecutive
-    {apo} (?!{apo})
-    | # ASCII single quote, surrounded by digits or letters (no dangling allowed)
-    {alnum} ' (?={alnum})
-    | # ASCII single quote after an s and at the token's end
-    s ' $
-    | # Terminal dimensions (superscript minus, 1, 2, and 3) attached to physical units
-    #  size-prefix                 unit-acronym    dimension
-    \b [yzafpn\u00B5mcdhkMGTPEZY]? {letter}{{1,3}} {power} $
-    | # Atom counts (subscript numbers) and ionization states (optional superscript
-    #   2 or 3 followed by a + or -) are attached to valid fragments of a chemical formula
-    \b (?:[A-Z][a-z]?|[\)\]])+ {subdigit}+ (?:[\u00B2\u00B3]?[\u207A\u207B])?
-    | # Any (Unicode) letter, digit, or the underscore
-    {alnum}
-    )+)"""
-    .format(alnum=ALNUM, apo=APOSTROPHE, power=POWER, subdigit=SUBDIGIT, hyphen=HYPHEN, letter=LETTER, number=NUMBER)
+    WORD_REGEX.format(
+        alnum=ALNUM, apo=APOSTROPHE, power=POWER, subdigit=SUBDIGIT, hyphen=HYPHEN, letter=LETTER, number=NUMBER,
+        end='$'
+    )
 )
-def word_tokenizer(sentence):
+def word_tokenizer(sentence, timeout=None):
     """
     This tokenizer extends the alphanumeric :func:`symbol_tokenizer` by splitting fewer cases:
 
@@ -240,47 +590,135 @@ def word_tokenizer(sentence):
        word if it is no longer than 3 letters (optionally 4 if the first letter is a power prefix
        in the range from yocto, y (10^-24) to yotta, Y (10^+24)).
     6. Subscript digits are attached if prefixed with letters that look like a chemical formula.
+
+    Some inputs, like long runs of capitalized letter pairs ("AbAbAb...") that almost look like a
+    chemical formula, make the token pattern backtrack for a time quadratic in their length.
+    To bound the latency, use the protected mode: Given a `timeout` in seconds (for example,
+    :data:`PROTECTED_TIMEOUT`), no scan of the text may take longer than that; Any space-separated
+    span whose scan times out is tokenized like the :func:`symbol_tokenizer` instead, and each
+    such fallback is counted in :data:`FALLBACKS`.
+    """
+    pruned = _prune(sentence, timeout)[0]
+    return [pruned[start:end] for start, end in _word_spans(pruned, timeout)]
+
+
+def word_tokenizer_spans(sentence, timeout=None):
     """
-    pruned = HYPHENATED_LINEBREAK.sub(r'\1\2', sentence)
-    tokens = [token for span in space_tokenizer(
-        pruned) for token in word_tokenizer.split(span) if token]
+    Span mode of the :func:`word_tokenizer`: return the ``(start, end)`` offsets of its tokens.
 
+    The offsets refer to the original `sentence`, not the text with the hyphenated linebreaks
+    removed; I.e., a token joined across a linebreak spans that linebreak, too.
+    """
+    pruned, points, shifts = _prune(sentence, timeout)
+    return _unprune(_word_spans(pruned, timeout), points, shifts)
+
+
+def word_tokenizer_with_spans(sentence, timeout=None):
+    """
+    Fused mode of the :func:`word_tokenizer` and :func:`word_tokenizer_spans`: return each token
+    together with its offsets, as ``(token, start, end)`` triples, while tokenizing only once.
+
+    As with the :func:`word_tokenizer`, the tokens do not contain the hyphenated linebreaks that
+    their spans in the `sentence` might contain.
+    """
+    pruned, points, shifts = _prune(sentence, timeout)
+    spans = _word_spans(pruned, timeout)
+    return [(pruned[start:end],) + span for (start, end), span in zip(spans, _unprune(spans, points, shifts))]
+
+
+def _word_spans(text, timeout=None):
+    """Tokenize a `text` without hyphenated linebreaks into the offsets of its word tokens."""
+    return _splice(text, _split_words(text, timeout=timeout), timeout=timeout)
+
+
+def _split_words(text, offset=0, timeout=None):
+    """Split a `text` into the offsets of its word tokens (shifted by `offset`), before any splicing."""
+    if _is_ascii(text):
+        try:
+            spans = list(_split_spans(ASCII_WORDS, text, timeout=timeout))
+        except TimeoutError:
+            spans = _split_protected(ASCII_WORDS, text, timeout)
+    elif timeout is not None:
+        spans = _split_protected(word_tokenizer.automaton, text, timeout)
+    else:
+        spans = [span for start, end in _split_spans(space_tokenizer.automaton, text)
+                 for span in _split_spans(word_tokenizer.automaton, text, start, end)]
+
+    if offset:
+        spans = [(start + offset, end + offset) for start, end in spans]
+
+    return spans
+
+
+def _split_protected(automaton, text, timeout):
+    """
+    Split each space-separated span of the `text` with the word `automaton`, but if that takes longer
+    than the `timeout`, split the span like the :func:`symbol_tokenizer` (in linear time) instead.
+    """
+    spans = []
+
+    for start, end in _split_spans(space_tokenizer.automaton, text):
+        try:
+            spans.extend(list(_split_spans(automaton, text, start, end, timeout)))
+        except TimeoutError:
+            FALLBACKS['words'] += 1
+            spans.extend(_split_spans(symbol_tokenizer.automaton, text, start, end))
+
+    return spans
+
+
+def _splice(text, spans, protected=(), timeout=None):
+    """
+    Splice the sentence terminal and any dangling punctuation off the word token `spans` of the `text`.
+
+    :param text: the text the spans refer to
+    :param spans: the token spans, as returned by :func:`_split_words`
+    :param protected: token spans that must not be split (URIs and e-mail addresses)
+    :param timeout: the maximum time in seconds of matching a token as a word
+    :returns: the spliced token spans
+    """
     # splice the sentence terminal off the last word/token if it has any at its borders
     # only look for the sentence terminal in the last three tokens
-    for idx, word in enumerate(reversed(tokens[-3:]), 1):
-        if (word_tokenizer.match(word) and not APO_MATCHER.match(word)) or \
-                any(t in word for t in SENTENCE_TERMINALS):
-            last = len(word) - 1
+    for idx, (start, end) in enumerate(reversed(spans[-3:]), 1):
+        word = text[start:end]
+
+        if (start, end) in protected:
+            break  # the last word is a URI or e-mail address: leave it as it is
 
-            if 0 == last or u'...' == word:
-                # any case of "..." or any single char (last == 0)
+        try:
+            is_word = word_tokenizer.automaton.match(word, timeout=timeout) is not None
+        except TimeoutError:
+            FALLBACKS['terminal'] += 1
+            is_word = False
+
+        if (is_word and not APO_MATCHER.match(word)) or any(t in word for t in SENTENCE_TERMINALS):
+            if 1 == end - start or u'...' == word:
+                # any case of "..." or any single char
                 pass  # leave the token as it is
-            elif any(word.rfind(t) == last for t in SENTENCE_TERMINALS):
+            elif word[-1] in SENTENCE_TERMINALS:
                 # "stuff."
-                tokens[-idx] = word[:-1]
-                tokens.insert(len(tokens) - idx + 1, word[-1])
-            elif any(word.find(t) == 0 for t in SENTENCE_TERMINALS):
+                spans[-idx] = (start, end - 1)
+                spans.insert(len(spans) - idx + 1, (end - 1, end))
+            elif word[0] in SENTENCE_TERMINALS:
                 # ".stuff"
-                tokens[-idx] = word[0]
-                tokens.insert(len(tokens) - idx, word[:-1])
+                spans[-idx] = (start, start + 1)
+                spans.insert(len(spans) - idx, (start, end - 1))
 
             break
 
-    # keep splicing off any dangling commas and (semi-) colons
-    dirty = True
-    while dirty:
-        dirty = False
-
-        for idx, word in enumerate(reversed(tokens), 1):
-            while len(word) > 1 and word[-1] in u',;:':
-                char = word[-1]  # the dangling comma/colon
-                word = word[:-1]
-                tokens[-idx] = word
-                tokens.insert(len(tokens) - idx + 1, char)
-                idx += 1
-                dirty = True
-            if dirty:
-                break  # restart check to avoid index errors
+    # splice off any dangling commas and (semi-) colons, one char per token, in a single pass
+    tokens = []
+
+    for start, end in spans:
+        stop = end
+
+        while stop - start > 1 and text[stop - 1] in u',;:' and (start, end) not in protected:
+            stop -= 1
+
+        tokens.append((start, stop))
+
+        for char in range(stop, end):
+            tokens.append((char, char + 1))
 
     return tokens
 
@@ -308,15 +746,452 @@ def word_tokenizer(sentence):
     )(?=[\s>"')\]}]|$)            # visual border
     """
 )
-def web_tokenizer(sentence):
+def web_tokenizer(sentence, timeout=None):
     """
     The web tokenizer works like the :func:`word_tokenizer`, but does not split URIs or
     e-mail addresses. It also un-escapes all escape sequences (except in URIs or email addresses).
+
+    With a `timeout`, it works in the protected mode of the :func:`word_tokenizer`; If the scan for
+    URIs and e-mail addresses times out, the sentence is tokenized without protecting them.
     """
-    return [
-        token for i, span in enumerate(web_tokenizer.split(sentence))
-        for token in ((span,) if i % 2 else word_tokenizer(unescape(span)))
-    ]
+    text, spans, _ = _web_spans(sentence, timeout)
+    return [text[start:end] for start, end in spans]
+
+
+def web_tokenizer_spans(sentence, timeout=None):
+    """
+    Span mode of the :func:`web_tokenizer`: return the ``(start, end)`` offsets of its tokens.
+
+    The offsets refer to the original, escaped `sentence`.
+    """
+    _, spans, segments = _web_spans(sentence, timeout)
+    starts = [segment[0] for segment in segments]
+    original = []
+
+    for start, end in spans:
+        segment, offset, to_original = segments[bisect_right(starts, start) - 1]
+        start, end = to_original((start - segment, end - segment))
+        original.append((start + offset, end + offset))
+
+    return original
+
+
+def _web_spans(sentence, timeout=None):
+    """
+    Tokenize a `sentence` into word tokens, but protect URIs and e-mail addresses.
+
+    Only the text between the URIs and e-mail addresses gets un-escaped and has its hyphenated
+    linebreaks removed. The sentence terminal and dangling punctuation are spliced off like a single
+    :func:`word_tokenizer` call on the whole sentence would.
+
+    :returns: the processed text, the token spans over it, and its segments as ``(start, offset,
+              to_original)`` tuples, where `to_original` maps a span over the segment (relative to
+              its `start` in the processed text) back into the original `sentence` (relative to the
+              segment's `offset` there)
+    """
+    pieces, spans, urls, segments = [], [], set(), []
+    length = last = 0
+
+    def add_text(end):
+        text = sentence[last:end]
+
+        if '&' in text:
+            text, to_original = _unescape_offsets(text)
+        else:
+            to_original = None
+
+        text, points, shifts = _prune(text, timeout)
+        pieces.append(text)
+        spans.extend(_split_words(text, length, timeout))
+        segments.append((length, last, _segment_mapper(to_original, points, shifts)))
+        return length + len(text)
+
+    try:
+        matches = list(web_tokenizer.automaton.finditer(sentence, timeout=timeout))
+    except TimeoutError:
+        FALLBACKS['web'] += 1
+        matches = []
+
+    for match in matches:
+        length = add_text(match.start())
+        url = match.group(1)
+        pieces.append(url)
+        spans.append((length, length + len(url)))
+        urls.add(spans[-1])
+        segments.append((length, match.start(), _identity))
+        length += len(url)
+        last = match.end()
+
+    add_text(len(sentence))
+    text = ''.join(pieces)
+    return text, _splice(text, spans, urls, timeout), segments
+
+
+def _identity(span):
+    return span
+
+
+def _segment_mapper(to_original, points, shifts):
+    """Combine the :func:`_unprune` and (optional) :func:`_unescape_offsets` mapping of one span."""
+    if to_original is None and not points:
+        return _identity
+    elif to_original is None:
+        return lambda span: _unprune([span], points, shifts)[0]
+    elif not points:
+        return to_original
+    else:
+        return lambda span: to_original(_unprune([span], points, shifts)[0])
+
+
+TOKENIZERS = {
+    'space': space_tokenizer,
+    'symbol': symbol_tokenizer,
+    'word': word_tokenizer,
+    'web': web_tokenizer,
+}
+"""The tokenizer functions by name, as used by :func:`tokenize_many`."""
+
+SPAN_TOKENIZERS = {
+    'space': space_tokenizer_spans,
+    'symbol': symbol_tokenizer_spans,
+    'word': word_tokenizer_spans,
+    'web': web_tokenizer_spans,
+}
+"""The span modes of the :data:`TOKENIZERS`, as used by :func:`index_file`."""
+
+
+def tokenize_many(sentences, tokenizer='word', workers=None, chunksize=512):
+    """
+    Tokenize many `sentences` in parallel, using a pool of `workers` processes.
+
+    The sentences are sent to the workers in chunks of `chunksize` sentences, where the compiled
+    tokenizer automata only need to be set up once per worker process, and the token lists
+    are yielded in the order of the input sentences.
+
+    :param sentences: any iterable of sentence strings
+    :param tokenizer: the name of a tokenizer in :data:`TOKENIZERS` or any (picklable) function
+    :param workers: the number of worker processes (default: number of CPUs);
+                    if 1, the sentences are tokenized in the calling process
+    :param chunksize: the number of sentences sent to a worker at a time
+    :returns: a generator of the token lists
+    """
+    if not callable(tokenizer):
+        tokenizer = TOKENIZERS[tokenizer]
+
+    if workers == 1:
+        for sentence in sentences:
+            yield tokenizer(sentence)
+
+        return
+
+    from multiprocessing import Pool  # only pay for importing it when actually used
+
+    pool = Pool(workers)
+
+    try:
+        for tokens in pool.imap(tokenizer, sentences, chunksize):
+            yield tokens
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def tokenize_to_ids(sentences, vocabulary, tokenizer='word', unk=0):
+    """
+    Tokenize `sentences` directly into a compact array of token IDs, without any token objects.
+
+    The IDs of all sentences are concatenated; The tokens of sentence ``i`` have the IDs
+    ``ids[offsets[i]:offsets[i + 1]]``. To use the IDs with NumPy, wrap the array without a copy:
+    ``numpy.frombuffer(ids, dtype=numpy.int32)``.
+
+    :param sentences: any iterable of sentence strings
+    :param vocabulary: a mapping of token strings to their IDs (for a :class:`ner.data.Dictionary`,
+                       see its ``get_str_item2idx`` method)
+    :param tokenizer: the name of a tokenizer in :data:`TOKENIZERS` or any tokenizer function
+    :param unk: the ID of unknown tokens (``<unk>``)
+    :returns: an ``array('i')`` of the token IDs and an ``array('l')`` of the sentence offsets
+    """
+    if not callable(tokenizer):
+        tokenizer = TOKENIZERS[tokenizer]
+
+    ids = array('i')
+    offsets = array('l', [0])
+    get = vocabulary.get
+
+    for sentence in sentences:
+        ids.extend([get(token, unk) for token in tokenizer(sentence)])
+        offsets.append(len(ids))
+
+    return ids, offsets
+
+
+def index_file(path, tokenizer='word', workers=None, chunk_size=1 << 24, index_path=None, timeout=None):
+    """
+    Tokenize a whole (UTF-8, one sentence per line) text file into a binary token index.
+
+    The file is memory-mapped and cut into chunks of about `chunk_size` bytes at line boundaries,
+    which the `workers` tokenize in parallel; Only the token offsets are sent back, not the text.
+    The index (see :data:`INDEX_HEADER`) stores the byte offsets of each token in the file, so a
+    :class:`TokenIndex` can read the tokens of any line without tokenizing the text again.
+
+    :param path: the text file to index
+    :param tokenizer: the name of a tokenizer in :data:`SPAN_TOKENIZERS`
+    :param workers: the number of worker processes (default: number of CPUs); 1 means no pool
+    :param chunk_size: the minimum size of the chunks in bytes (except the last)
+    :param index_path: where to write the index (default: the `path` plus :data:`INDEX_SUFFIX`)
+    :param timeout: the timeout of the protected mode of the word and web tokenizers
+    :returns: the path of the index file
+    """
+    if tokenizer not in SPAN_TOKENIZERS:
+        raise ValueError('unknown tokenizer %r' % tokenizer)
+
+    index_path = index_path or path + INDEX_SUFFIX
+    size = os.path.getsize(path)
+    typecode = 'I' if size < 1 << 32 else 'Q'
+    temporary = '%s.%d' % (index_path, os.getpid())
+    num_lines = num_tokens = 0
+    line_offsets = array(typecode, [0])
+
+    with open(temporary, 'wb') as index, tempfile.TemporaryFile() as lines:
+        index.write(INDEX_HEADER.pack(INDEX_MAGIC, b'', 0, 0, 0, 0))
+        chunks = _chunks(path, size, chunk_size)
+        worker = partial(_index_chunk, path=path, tokenizer=tokenizer, typecode=typecode, timeout=timeout)
+
+        for spans, counts in tokenize_many(chunks, worker, workers=workers, chunksize=1):
+            for count in counts:
+                num_tokens += count
+                line_offsets.append(num_tokens)
+
+            num_lines += len(counts)
+            _write_array(index, spans)
+            _write_array(lines, line_offsets)
+            del line_offsets[:]
+
+        _write_array(lines, line_offsets)  # if there were no chunks, the initial zero is still left
+        lines.seek(0)
+        shutil.copyfileobj(lines, index)
+        index.seek(0)
+        index.write(INDEX_HEADER.pack(INDEX_MAGIC, tokenizer.encode('ascii'), line_offsets.itemsize,
+                                      size, num_lines, num_tokens))
+
+    os.rename(temporary, index_path)
+    return index_path
+
+
+def token_index(path, tokenizer='word', workers=None, index_path=None):
+    """
+    Open the :class:`TokenIndex` of a text file, but first (re-) build it with :func:`index_file` if it
+    does not exist yet, is older than the text file, or was made with another tokenizer.
+    """
+    index_path = index_path or path + INDEX_SUFFIX
+
+    try:
+        if os.path.getmtime(index_path) >= os.path.getmtime(path):
+            index = TokenIndex(path, index_path)
+
+            if index.tokenizer == tokenizer:
+                return index
+
+            index.close()
+    except (IOError, OSError, ValueError):
+        pass
+
+    return TokenIndex(path, index_file(path, tokenizer, workers, index_path=index_path))
+
+
+class TokenIndex(object):
+    """
+    A memory-mapped, read-only token index of a text file, as written by :func:`index_file`.
+
+    Iterating over the index yields the token list of each line in the text file, and indexing
+    it with a line number returns that line's tokens; The tokens are decoded from the mapped text
+    file only when requested and are always the original text of their spans (i.e., they are not
+    un-escaped and do not join hyphenated linebreaks). Call :meth:`close` to release the mapped files.
+    """
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + INDEX_SUFFIX
+
+        with open(self.index_path, 'rb') as fp:
+            self._index = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, name, width, size, self.num_lines, self.num_tokens = INDEX_HEADER.unpack_from(self._index)
+
+        if magic != INDEX_MAGIC:
+            raise ValueError('not a token index: %s' % self.index_path)
+        elif size != os.path.getsize(path):
+            raise ValueError('the token index %s does not match %s' % (self.index_path, path))
+
+        self.tokenizer = name.rstrip(b'\x00').decode('ascii')
+        typecode = 'I' if width == 4 else 'Q'
+        start = INDEX_HEADER.size
+        self._spans = self._view(typecode, start, 2 * self.num_tokens)
+        self._lines = self._view(typecode, start + 2 * self.num_tokens * width, self.num_lines + 1)
+
+        if size:
+            with open(path, 'rb') as fp:
+                self._text = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._text = b''  # empty files cannot be mapped
+
+    def _view(self, typecode, offset, length):
+        """Return the `length` offsets from `offset` on in the index, without a copy if possible."""
+        data = memoryview(self._index)[offset:offset + length * array(typecode).itemsize]
+
+        if sys.byteorder == 'little':
+            return data.cast(typecode)
+
+        values = array(typecode, data.tobytes())
+        values.byteswap()
+        return values
+
+    def __len__(self):
+        return self.num_lines
+
+    def __getitem__(self, line):
+        text = self._text
+        return [text[start:end].decode('utf-8', 'surrogateescape') for start, end in self.spans(line)]
+
+    def __iter__(self):
+        for line in range(self.num_lines):
+            yield self[line]
+
+    def spans(self, line):
+        """Return the ``(start, end)`` byte offsets of the tokens of the `line` in the text file."""
+        if not 0 <= line < self.num_lines:
+            raise IndexError('line %d out of range' % line)
+
+        offsets = self._spans[2 * self._lines[line]:2 * self._lines[line + 1]]
+        return list(zip(offsets[::2], offsets[1::2]))
+
+    def close(self):
+        """Release the memory-mapped files."""
+        for view in (self._spans, self._lines):
+            if isinstance(view, memoryview):
+                view.release()
+
+        self._index.close()
+
+        if self._text:
+            self._text.close()
+
+
+def _chunks(path, size, chunk_size):
+    """Yield the ``(start, end)`` byte offsets of chunks of the file that end at line boundaries."""
+    if not size:
+        return
+
+    with open(path, 'rb') as fp:
+        mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        start = 0
+
+        while start < size:
+            end = mapped.find(b'\n', min(start + chunk_size, size) - 1)
+            end = size if end == -1 else end + 1
+            yield start, end
+            start = end
+    finally:
+        mapped.close()
+
+
+def _index_chunk(chunk, path, tokenizer, typecode, timeout=None):
+    """
+    Tokenize the lines in a `chunk` of the file at `path` into the index arrays of :func:`index_file`.
+
+    :returns: the token offsets as a flat array of ``(start, end)`` pairs and the tokens per line
+    """
+    start, end = chunk
+    tokenize = SPAN_TOKENIZERS[tokenizer]
+
+    if timeout is not None and tokenizer in ('word', 'web'):
+        tokenize = partial(tokenize, timeout=timeout)
+
+    spans, counts = array(typecode), array(typecode)
+
+    with open(path, 'rb') as fp:
+        mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        while start < end:
+            stop = mapped.find(b'\n', start, end)
+            stop = end if stop == -1 else stop + 1
+            line = mapped[start:stop].decode('utf-8', 'surrogateescape').rstrip('\r\n')
+            offsets = tokenize(line)
+
+            if _is_ascii(line):
+                for first, last in offsets:
+                    spans.append(start + first)
+                    spans.append(start + last)
+            else:
+                spans.extend(_byte_offsets(line, offsets, start))
+
+            counts.append(len(offsets))
+            start = stop
+    finally:
+        mapped.close()
+
+    return spans, counts
+
+
+def _byte_offsets(text, spans, offset):
+    """Map the character `spans` over a `text` to a flat list of UTF-8 byte offsets, shifted by `offset`."""
+    offsets = []
+    char = byte = 0
+
+    for start, end in spans:
+        if start < char:
+            char = byte = 0  # never happens for tokenizer spans, which are in order
+
+        byte += len(text[char:start].encode('utf-8', 'surrogateescape'))
+        char = start
+        offsets.append(offset + byte)
+        offsets.append(offset + byte + len(text[start:end].encode('utf-8', 'surrogateescape')))
+
+    return offsets
+
+
+def _write_array(fp, values):
+    """Write an array of offsets to `fp` in little-endian byte order."""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    values.tofile(fp)
+
+
+def _tokenize_lines(lines, tokenizer, splitter=None, linesep='\n'):
+    """Tokenize a block of `lines` into the output text of :func:`main`, one line per sentence."""
+    output = []
+
+    for line in lines:
+        tokens = tokenizer(line)
+
+        if splitter is not None:
+            tokens = splitter(tokens)  # a generator: tokens are split while they get joined
+
+        output.append(' '.join(tokens))
+
+    output.append('')
+    return linesep.join(output)
+
+
+def _blocks(lines, size):
+    """Group `lines` into lists of lines that are at least `size` characters long (except the last)."""
+    block, length = [], 0
+
+    for line in lines:
+        block.append(line)
+        length += len(line)
+
+        if length >= size:
+            yield block
+            block, length = [], 0
+
+    if block:
+        yield block
 
 
 def main():
@@ -325,17 +1200,7 @@ def main():
     from sys import argv, stdout, stdin, stderr, getdefaultencoding, version_info
     from os import path, linesep
 
-    def _tokenize(sentence, tokenizer):
-        sep = None
-
-        for token in tokenizer(sentence):
-            if sep is not None:
-                stdout.write(sep)
-
-            stdout.write(token)
-            sep = ' '
-
-        stdout.write(linesep)
+    from timeit import default_timer
 
     NUM_TOKENIZERS = 4
     SPACE, ALNUM, TOKEN, WEB = list(range(NUM_TOKENIZERS))
@@ -344,6 +1209,7 @@ def main():
     TOKENIZER[ALNUM] = symbol_tokenizer
     TOKENIZER[TOKEN] = word_tokenizer
     TOKENIZER[WEB] = web_tokenizer
+    NAMES = ['space', 'symbol', 'word', 'web']
 
     parser = ArgumentParser(
         usage='%(prog)s [--mode] [FILE ...]',
@@ -367,6 +1233,48 @@ def main():
         help='split contractions like "don\'t" in alphanumeric tokens in two'
     )
     parser.add_argument('--encoding', '-e', help='define encoding to use')
+    parser.add_argument(
+        '--jobs',
+        '-j',
+        metavar='N',
+        type=int,
+        default=1,
+        help='number of worker processes that tokenize blocks of lines [%(default)d]'
+    )
+    parser.add_argument(
+        '--buffer-size',
+        '-b',
+        metavar='CHARS',
+        type=int,
+        default=0,
+        help='read, tokenize, and write blocks of lines of at least CHARS characters; '
+        'if 0, process line by line, unless using several jobs [%(default)d]'
+    )
+    parser.add_argument(
+        '--throughput',
+        action='store_true',
+        help='report the throughput in lines/sec on STDERR'
+    )
+    parser.add_argument(
+        '--protected',
+        action='store_true',
+        help='protected mode of the token and web tokenizers: fall back to the alnum tokenizer on '
+        'spans that take longer than the --timeout to scan'
+    )
+    parser.add_argument(
+        '--timeout',
+        metavar='SECONDS',
+        type=float,
+        default=PROTECTED_TIMEOUT,
+        help='the regex timeout of the protected mode [%(default)s]'
+    )
+    parser.add_argument(
+        '--index',
+        '-i',
+        action='store_true',
+        help='instead of writing the tokens to STDOUT, write a binary token index next to each '
+        '(UTF-8) FILE, tokenizing memory-mapped chunks of it in parallel'
+    )
     mode = parser.add_mutually_exclusive_group()
     parser.set_defaults(mode=TOKEN)
     mode.add_argument('--space', '-s', action='store_const',
@@ -379,7 +1287,29 @@ def main():
                       dest='mode', const=WEB, help=web_tokenizer.__doc__)
 
     args = parser.parse_args()
+
+    if args.timeout <= 0:
+        parser.error('the timeout must be positive')
+
     tokenizer_func = TOKENIZER[args.mode]
+    timeout = args.timeout if args.protected else None
+
+    if timeout is not None and args.mode in (TOKEN, WEB):
+        tokenizer_func = partial(tokenizer_func, timeout=timeout)
+
+    if args.index:
+        if not args.files:
+            parser.error('indexing requires FILE arguments')
+
+        for txt_file_path in args.files:
+            start = default_timer()
+            index_path = index_file(txt_file_path, NAMES[args.mode], workers=args.jobs, timeout=timeout)
+
+            if args.throughput:
+                stderr.write('indexed %s in %.3f sec' % (index_path, default_timer() - start))
+                stderr.write(linesep)
+
+        return
 
     # fix broken Unicode handling in Python 2.x
     # see http://www.macfreek.nl/memory/Encoding_of_Python_stdout
@@ -398,24 +1328,43 @@ def main():
             stderr.write(linesep)
 
     if args.split_contractions:
-
-        def tokenizer(sentence):
-            return split_contractions(tokenizer_func(sentence))
+        splitter = iter_split_contractions
     elif args.possessive_marker:
-
-        def tokenizer(sentence):
-            return split_possessive_markers(tokenizer_func(sentence))
-    else:
-        tokenizer = tokenizer_func
-
-    if args.files:
-        for txt_file_path in args.files:
-            with codecs.open(txt_file_path, 'r', encoding=(args.encoding or 'utf-8')) as fp:
-                for line in fp:
-                    _tokenize(line, tokenizer)
+        splitter = iter_split_possessive_markers
     else:
-        for line in stdin:
-            _tokenize(line, tokenizer)
+        splitter = None
+
+    if args.jobs < 1:
+        parser.error('the number of jobs must be positive')
+
+    buffer_size = args.buffer_size or (1 if args.jobs == 1 else 1 << 20)
+    tokenizer = partial(_tokenize_lines, tokenizer=tokenizer_func, splitter=splitter, linesep=linesep)
+
+    def read_lines():
+        if args.files:
+            for txt_file_path in args.files:
+                with codecs.open(txt_file_path, 'r', encoding=(args.encoding or 'utf-8')) as fp:
+                    for line in fp:
+                        yield line
+        else:
+            for line in stdin:
+                yield line
+
+    blocks = _blocks(read_lines(), buffer_size)
+    num_lines = 0
+    start = default_timer()
+
+    for output in tokenize_many(blocks, tokenizer, workers=args.jobs, chunksize=1):
+        stdout.write(output)
+
+        if args.throughput:
+            num_lines += output.count(linesep)
+
+    if args.throughput:
+        seconds = default_timer() - start
+        stderr.write('tokenized %d lines in %.3f sec: %.1f lines/sec' % (
+            num_lines, seconds, num_lines / seconds if seconds else float('inf')))
+        stderr.write(linesep)
 
 
 if __name__ == '__main__':
@@ -14,19 +14,39 @@ import numpy as np
 from gensim.models import word2vec
 from gensim.models.keyedvectors import KeyedVectors
 
+try:
+    from .tokenizer import token_index
+except ImportError:
+    # if used as a script
+    from tokenizer import token_index
+
 vector_dim = 150
 root_path = os.path.join(os.path.dirname(__file__), 'data/')
 
 
 class MySentences(object):
-    """Sentence class."""
+    """
+    Sentence class.
+
+    Without a tokenizer, each line is split on spaces. Given the name of a tokenizer (e.g. 'word'),
+    the file is tokenized only once into a token index next to it, which every pass then reads.
+    """
 
-    def __init__(self, filename):
+    def __init__(self, filename, tokenizer=None):
         self.filename = filename
+        self.tokenizer = tokenizer
 
     def __iter__(self):
-        for line in open(self.filename):
-            yield line.split()
+        if self.tokenizer is None:
+            for line in open(self.filename):
+                yield line.split()
+        else:
+            index = token_index(self.filename, self.tokenizer)
+            try:
+                for tokens in index:
+                    yield tokens
+            finally:
+                index.close()
 
 
 class WordEmbeddingModel():